@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+Time to build the cross rates matrix of a tickers snapshot and scan its triangular cycles,
+with NumPy and with the pure Python fallback.
+
+Pairs mimic the C-Cex list: every coin is quoted in BTC, some of them also in the other base
+currencies, and a few are traded against each other.
+
+Usage::
+
+    python benchmarks/bench_arbitrage.py [coins] [cross pairs]
+
+"""
+
+import os
+import sys
+import random
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ccex_api import CrossRates, TickerSnapshot  # noqa: E402
+from ccex_api import orderbook  # noqa: E402
+
+BASES = ('btc', 'usd', 'ltc', 'eth', 'doge', 'usdt')
+
+
+def prices(coins=400, cross=300, seed=0):
+    """
+    Returns:
+        dict: generated `tickers_all_pairs_market_data` result
+    """
+    rand = random.Random(seed)
+    values = dict(('coin{}'.format(index), 10 ** rand.uniform(-8, -1)) for index in range(coins))
+    values.update(btc=1.0, usd=1 / 6000.0, ltc=0.012, eth=0.07, doge=3e-7, usdt=1 / 6000.0)
+    pairs = set('{}-btc'.format(coin) for coin in values if coin != 'btc')
+    names = sorted(values)
+    while len(pairs) < coins + cross:
+        first, second = rand.sample(names, 2)
+        if '{}-{}'.format(second, first) not in pairs:
+            pairs.add('{}-{}'.format(first, second))
+
+    result = {}
+    for pair in sorted(pairs):
+        first, second = pair.split('-')
+        price = values[first] / values[second] * rand.uniform(0.99, 1.01)
+        result[pair] = {'high': price * 1.05, 'low': price * 0.95, 'avg': price, 'buy': price * 0.998,
+                        'sell': price * 1.002, 'lastprice': price, 'updated': 1459411200}
+    return result
+
+
+def measure(result):
+    snapshot = TickerSnapshot.from_prices(result)
+    rates = CrossRates.from_snapshot(snapshot, fee=0.002)
+    build = min(timeit.repeat(lambda: CrossRates.from_snapshot(snapshot, fee=0.002), number=5, repeat=3)) / 5
+    scan = min(timeit.repeat(lambda: rates.triangles(top=10), number=5, repeat=3)) / 5
+    return rates, build, scan
+
+
+def main(coins=400, cross=300):
+    result = prices(coins, cross)
+    print('{} pairs'.format(len(result)))
+
+    modes = [('numpy', None)] if orderbook.numpy() is not None else []
+    modes.append(('python', None))
+    best = None
+    for name, _ in modes:
+        if name == 'python':
+            orderbook._numpy[:] = [None]
+        rates, build, scan = measure(result)
+        triangles = rates.triangles(top=10)
+        print('  {:<8} {:>4} currencies {:>9.2f} ms build {:>9.2f} ms scan, best cycle {:.5f}'.format(
+            name, len(rates), build * 1e3, scan * 1e3, triangles[0].rate if triangles else 0))
+        if best is not None:
+            assert [triangle.currencies for triangle in triangles] == best
+        best = [triangle.currencies for triangle in triangles]
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
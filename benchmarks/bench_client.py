@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+Throughput and latency of the sync client against the local mock C-Cex API.
+
+For each scenario and thread count, reports requests per second, p50 / p99 latency,
+response parse time (`_parse_response` alone, on the same body) and peak memory
+allocated by one call. Results are printed as a table and can be written as JSON,
+to compare two revisions.
+
+Usage::
+
+    python benchmarks/bench_client.py [--markets 500] [--depth 100] [--threads 1,4,16]
+                                      [--requests 200] [--scenarios prices,full_orderbook]
+                                      [--output results.json]
+
+"""
+
+import os
+import sys
+import json
+import math
+import argparse
+import platform
+import threading
+import tracemalloc
+
+from time import perf_counter
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ccex_api import CCexAPI, CCexAPIError, CCexAPITransport  # noqa: E402
+from mock_server import MockCCexServer  # noqa: E402
+
+
+def scenarios(depth, count):
+    """
+    Returns:
+        dict(str, callable): call of each scenario, given a client
+    """
+    return {
+        'prices': lambda ccex: ccex.tickers.tickers_all_pairs_market_data(),
+        'pair_ticker': lambda ccex: ccex.tickers.tickers_pair_market_data('usd', 'btc'),
+        'markets': lambda ccex: ccex.public.get_markets(),
+        'market_summaries': lambda ccex: ccex.public.get_market_summaries(),
+        'orderbook': lambda ccex: ccex.public.get_orderbook('USD-BTC', 'both', depth),
+        'full_orderbook': lambda ccex: ccex.public.get_full_orderbook(depth),
+        'market_history': lambda ccex: ccex.public.get_market_history('USD-BTC', count),
+        'balances': lambda ccex: ccex.private.get_balances(),
+        'open_orders': lambda ccex: ccex.private.get_open_orders('USD-BTC'),
+    }
+
+
+def percentile(values, fraction):
+    """
+    Nearest rank percentile of sorted values.
+    """
+    if not values:
+        return None
+    return values[min(len(values), max(1, int(math.ceil(fraction * len(values))))) - 1]
+
+
+def measure_throughput(ccex, call, threads, requests):
+    """
+    Returns:
+        dict: `req_per_s`, `p50_ms`, `p99_ms` and number of `errors`
+    """
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    per_thread = max(1, requests // threads)
+
+    def worker():
+        local_latencies = []
+        local_errors = 0
+        for _ in range(per_thread):
+            start = perf_counter()
+            try:
+                call(ccex)
+            except CCexAPIError:
+                local_errors += 1
+            local_latencies.append(perf_counter() - start)
+        with lock:
+            latencies.extend(local_latencies)
+            errors[0] += local_errors
+
+    workers = [threading.Thread(target=worker) for _ in range(threads)]
+    start = perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'req_per_s': len(latencies) / elapsed,
+        'p50_ms': percentile(latencies, 0.50) * 1e3,
+        'p99_ms': percentile(latencies, 0.99) * 1e3,
+        'errors': errors[0],
+    }
+
+
+def measure_parse(ccex, call, repeat=5):
+    """
+    Time `_parse_response` alone, on the body of one call.
+
+    Returns:
+        tuple(float, int): best parse time in milliseconds, and body size in bytes
+    """
+    captured = {}
+    parse_response = ccex._parse_response
+
+    def capture(group):
+        def _parse_response(res, body, path, key=None):
+            captured.update(body=body, path=path, key=key)
+            return parse_response(res, body, path, key)
+        group._parse_response = _parse_response
+
+    groups = [group for group in (getattr(ccex, name, None) for name in ('tickers', 'public', 'private')) if group]
+    for group in groups:
+        capture(group)
+    try:
+        call(ccex)
+    finally:
+        for group in groups:
+            del group._parse_response
+
+    best = None
+    for _ in range(repeat):
+        start = perf_counter()
+        parse_response(None, captured['body'], captured['path'], captured['key'])
+        elapsed = perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best * 1e3, len(captured['body'])
+
+
+def measure_memory(ccex, call):
+    """
+    Returns:
+        int: peak bytes allocated by one call, result included
+    """
+    tracemalloc.start()
+    try:
+        result = call(ccex)
+        peak = tracemalloc.get_traced_memory()[1]
+        del result
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run(args):
+    results = []
+    with MockCCexServer(markets=args.markets, depth=args.depth, history=args.count) as server:
+        ccex = CCexAPI(
+            'api_key', 'api_secret',
+            api_url=server.url,
+            transport=CCexAPITransport(pool_maxsize=max(args.threads)),
+            fast_json=args.fast_json)
+        calls = scenarios(args.depth, args.count)
+
+        for name in args.scenarios:
+            call = calls[name]
+            # warm up the connection pool and the server payloads
+            call(ccex)
+            parse_ms, body_bytes = measure_parse(ccex, call)
+            peak_memory = measure_memory(ccex, call)
+
+            for threads in args.threads:
+                result = dict(
+                    measure_throughput(ccex, call, threads, args.requests),
+                    scenario=name,
+                    threads=threads,
+                    parse_ms=parse_ms,
+                    body_bytes=body_bytes,
+                    peak_memory_bytes=peak_memory)
+                results.append(result)
+                print('{scenario:<18} {threads:>3} threads {req_per_s:>9.1f} req/s  p50 {p50_ms:>8.2f} ms  '
+                      'p99 {p99_ms:>8.2f} ms  parse {parse_ms:>8.2f} ms  body {body_bytes:>10} B  '
+                      'peak {peak_memory_bytes:>11} B  errors {errors}'.format(**result))
+                sys.stdout.flush()
+        ccex.close()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--markets', type=int, default=500, help='number of markets served')
+    parser.add_argument('--depth', type=int, default=100, help='order books depth')
+    parser.add_argument('--count', type=int, default=100, help='number of trades per market history')
+    parser.add_argument('--threads', default='1,4,16', help='comma separated thread counts')
+    parser.add_argument('--requests', type=int, default=200, help='requests per scenario and thread count')
+    parser.add_argument('--scenarios', default=None,
+                        help='comma separated scenarios, among: {}'.format(', '.join(sorted(scenarios(0, 0)))))
+    parser.add_argument('--fast-json', action='store_true', help='decode with orjson or ujson when installed')
+    parser.add_argument('--output', help='JSON file to write the results to')
+    args = parser.parse_args(argv)
+
+    args.threads = [int(threads) for threads in args.threads.split(',')]
+    args.scenarios = args.scenarios.split(',') if args.scenarios else sorted(scenarios(0, 0))
+    unknown = set(args.scenarios) - set(scenarios(0, 0))
+    if unknown:
+        parser.error('unknown scenarios: {}'.format(', '.join(sorted(unknown))))
+
+    results = run(args)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'config': {
+                    'markets': args.markets,
+                    'depth': args.depth,
+                    'count': args.count,
+                    'requests': args.requests,
+                    'fast_json': args.fast_json,
+                },
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'results': results,
+            }, f, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
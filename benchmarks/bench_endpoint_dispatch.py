@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+Per call overhead of endpoints dispatch, from the method call to `_call`.
+
+`_call` is replaced by a no-op so only the cost of building the call name,
+path and params is measured. The former `sys._getframe` based dispatch is
+kept here as a reference.
+
+Usage::
+
+    python benchmarks/bench_endpoint_dispatch.py [iterations]
+
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ccex_api import CCexAPIPublic  # noqa: E402
+
+
+class NoCall(object):
+    def _call(self, call, path, params=None, headers=None, authenticated=False, key=None, typed=None):
+        return call, path, params
+
+
+# noinspection PyUnusedLocal
+class FramePublic(NoCall):
+    def _public_call(self, key=None):
+        # noinspection PyProtectedMember
+        caller = sys._getframe().f_back
+        call = caller.f_code.co_name.replace('_', '')
+        params = dict((k.replace('_', ''), v) for k, v in caller.f_locals.items() if k != 'self')
+
+        return self._call(call=call, path='api_pub.html', params=params, key=key)
+
+    def get_orderbook(self, market, type_, depth=50):
+        return self._public_call()
+
+
+class SpecPublic(NoCall, CCexAPIPublic):
+    def __init__(self):
+        pass
+
+
+def main(number=200000):
+    results = {}
+    for name, client in (('frame introspection', FramePublic()), ('endpoint spec', SpecPublic())):
+        assert client.get_orderbook('USD-BTC', 'both') == (
+            'getorderbook', 'api_pub.html', {'market': 'USD-BTC', 'type': 'both', 'depth': 50})
+        best = min(timeit.repeat(lambda: client.get_orderbook('USD-BTC', 'both'), number=number, repeat=5))
+        results[name] = best / number * 1e9
+        print('{:<20} {:>8.0f} ns/call'.format(name, results[name]))
+
+    print('{:<20} {:>8.2f}x'.format('speedup', results['frame introspection'] / results['endpoint spec']))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
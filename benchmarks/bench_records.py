@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+Memory held by snapshots of market summaries and tickers, and field access time,
+as decoded JSON dicts and as typed records.
+
+Usage::
+
+    python benchmarks/bench_records.py [markets] [snapshots]
+
+"""
+
+import os
+import sys
+import json
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ccex_api import MarketSummary, Ticker  # noqa: E402
+from mock_server import Payloads  # noqa: E402
+
+
+def snapshots_size(bodies, convert):
+    """
+    Returns:
+        tuple(list, int): decoded snapshots and bytes they hold
+    """
+    tracemalloc.start()
+    try:
+        snapshots = [convert(json.loads(body)) for body in bodies]
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    return snapshots, size
+
+
+def main(markets=500, snapshots=60):
+    payloads = Payloads(markets=markets)
+    cases = (
+        ('market summaries', 'api_pub.html', {'a': ['getmarketsummaries']},
+         lambda data: data['result'], MarketSummary.from_result,
+         lambda summaries: sum(summary['Bid'] for summary in summaries),
+         lambda summaries: sum(summary.bid for summary in summaries)),
+        ('prices', 'prices.json', {},
+         lambda data: data, Ticker.from_result,
+         lambda tickers: sum(ticker['lastprice'] for ticker in tickers.values()),
+         lambda tickers: sum(ticker.lastprice for ticker in tickers.values())),
+    )
+
+    for name, path, params, raw, typed, raw_access, typed_access in cases:
+        # distinct bodies, so that values are not shared between snapshots
+        bodies = []
+        for _ in range(snapshots):
+            payloads.bodies.clear()
+            bodies.append(payloads.body(path, params))
+
+        raw_snapshots, raw_size = snapshots_size(bodies, raw)
+        typed_snapshots, typed_size = snapshots_size(bodies, lambda data: typed(raw(data)))
+
+        raw_time = min(timeit.repeat(lambda: raw_access(raw_snapshots[0]), number=100, repeat=5)) / 100
+        typed_time = min(timeit.repeat(lambda: typed_access(typed_snapshots[0]), number=100, repeat=5)) / 100
+
+        print('{} ({} markets, {} snapshots)'.format(name, markets, snapshots))
+        print('  {:<8} {:>12} bytes {:>10.1f} us/scan'.format('dicts', raw_size, raw_time * 1e6))
+        print('  {:<8} {:>12} bytes {:>10.1f} us/scan'.format('records', typed_size, typed_time * 1e6))
+        print('  {:<8} {:>12.2f}x {:>15.2f}x'.format('ratio', raw_size / float(typed_size), raw_time / typed_time))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+Signed requests prepared per second on one core, from endpoint parameters
+to a `requests.PreparedRequest` with its `apisign` header.
+
+The former `requests.Request.prepare` and per call `hmac.new` path is kept here
+as a reference, both must produce the same URL and signature.
+
+Usage::
+
+    python benchmarks/bench_signing.py [iterations]
+
+"""
+
+import os
+import sys
+import hmac
+import timeit
+
+import requests
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from ccex_api import CCexAPIPrivate  # noqa: E402
+
+PARAMS = {'market': 'USD-BTC', 'quantity': 0.25, 'rate': 4123.5}
+
+
+class FixedNonce(object):
+    def __call__(self):
+        return 1500000000000
+
+
+class PrepareSignPrivate(CCexAPIPrivate):
+    def _prepare_request(self, call, path, params=None, headers=None, authenticated=False):
+        params['a'] = call
+        params['apikey'] = self.api_key
+        params['nonce'] = self.nonce()
+        prep_req = requests.Request(
+            method='GET',
+            url='{url}/{path}'.format(url=self.API_URL, path=path),
+            params=params,
+            headers=headers).prepare()
+        prep_req.headers['apisign'] = hmac.new(
+            self.api_secret.encode('utf-8'),
+            prep_req.url.encode('utf-8'),
+            'sha512'
+        ).hexdigest()
+        return prep_req
+
+
+def main(number=50000):
+    requests_prepared, times = {}, {}
+    for name, cls in (('prepare + hmac.new', PrepareSignPrivate), ('signer', CCexAPIPrivate)):
+        client = cls('api_key', 'api_secret', nonce=FixedNonce())
+
+        def prepare():
+            return client._prepare_request('buylimit', 'api.html', dict(PARAMS), None, True)
+
+        requests_prepared[name] = prepare()
+        times[name] = min(timeit.repeat(prepare, number=number, repeat=5)) / number
+        print('{:<20} {:>10.0f} req/s {:>8.0f} ns/req'.format(name, 1 / times[name], times[name] * 1e9))
+
+    reference, prep_req = requests_prepared['prepare + hmac.new'], requests_prepared['signer']
+    assert (prep_req.url, prep_req.headers['apisign']) == (reference.url, reference.headers['apisign'])
+    print('{:<20} {:>10.2f}x'.format('speedup', times['prepare + hmac.new'] / times['signer']))
+
+
+if __name__ == '__main__':
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+Local mock of the C-Cex API, serving generated tickers, public and private payloads
+of configurable sizes.
+
+Payloads are generated once per distinct query then served from memory, so the server
+costs as little as possible to the measured client. Authenticated calls only check
+that an `apisign` header is present.
+
+Usage::
+
+    python benchmarks/mock_server.py [--port 8080] [--markets 500] [--depth 100] [--history 100]
+
+    ccex = CCexAPI('api_key', 'api_secret', api_url='http://127.0.0.1:8080/t')
+
+"""
+
+import sys
+import json
+import random
+import argparse
+import multiprocessing
+
+try:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+    from urllib.parse import urlparse, parse_qs
+except ImportError:  # python 2
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+    from urlparse import urlparse, parse_qs
+
+TIMESTAMP = 1459411200
+
+
+class Payloads(object):
+    """
+    Generated API results, markets are named `coinN-btc` and `usd-btc`.
+    """
+
+    def __init__(self, markets=500, depth=100, history=100, orders=20, seed=0):
+        """
+        Args:
+            markets (int): Number of markets
+            depth (int): Maximum order book depth served
+            history (int): Maximum number of trades served per market
+            orders (int): Number of open orders of the account
+            seed (int): Random seed, for reproducible payloads
+        """
+        self.random = random.Random(seed)
+        self.depth = depth
+        self.history = history
+        self.orders = orders
+        self.markets = ['usd-btc'] + ['coin{}-btc'.format(index) for index in range(1, markets)]
+        self.prices = dict((market, 10 ** self.random.uniform(-8, 3)) for market in self.markets)
+        self.bodies = {}
+
+    def body(self, path, params):
+        """
+        Returns:
+            bytes: response body of a call, `None` for an unknown path
+        """
+        cache_key = path, tuple(sorted((name, values[0]) for name, values in params.items()
+                                       if name not in ('apikey', 'nonce')))
+        body = self.bodies.get(cache_key)
+        if body is None:
+            data = self.data(path, dict((name, values[0]) for name, values in params.items()))
+            if data is None:
+                return None
+            body = self.bodies[cache_key] = json.dumps(data).encode('utf-8')
+        return body
+
+    def data(self, path, params):
+        name = path.rsplit('/', 1)[-1]
+        if name.endswith('.json'):
+            return self.ticker(name[:-len('.json')])
+
+        call = params.get('a', '')
+        method = getattr(self, 'call_{}'.format(call), None)
+        if method is None:
+            return {'success': False, 'message': 'Unknown call {}'.format(call), 'result': None}
+        return {'success': True, 'message': '', 'result': method(params)}
+
+    def ticker(self, name):
+        if name == 'prices':
+            return dict((market, self.market_ticker(market)) for market in self.markets)
+        if name == 'coinnames':
+            return dict((market.split('-')[0], market.split('-')[0].upper()) for market in self.markets)
+        if name == 'pairs':
+            return {'pairs': self.markets}
+        if name.startswith('volume_'):
+            return {'ticker': dict((market.split('-')[0], {'last': self.prices[market], 'vol': self.random.random()})
+                                   for market in self.markets)}
+        return {'ticker': self.market_ticker(name if name in self.prices else 'usd-btc')}
+
+    def market_ticker(self, market):
+        price = self.prices[market]
+        return {
+            'high': price * 1.05, 'low': price * 0.95, 'avg': price,
+            'lastbuy': price * 0.999, 'lastsell': price * 1.001,
+            'buy': price * 0.998, 'sell': price * 1.002,
+            'lastprice': price, 'buysupport': self.random.uniform(0, 100),
+            'updated': TIMESTAMP,
+        }
+
+    def levels(self, market, depth, side):
+        price = self.prices[market]
+        sign = -1 if side == 'buy' else 1
+        return [{'Quantity': self.random.uniform(0.01, 100), 'Rate': price * (1 + sign * 0.001 * (level + 1))}
+                for level in range(depth)]
+
+    def trades(self, market, count):
+        price = self.prices[market]
+        return [{
+            'Id': 1000000 - index,
+            'TimeStamp': '2016-03-31 08:00:00',
+            'Quantity': self.random.uniform(0.01, 10),
+            'Price': price,
+            'Total': price,
+            'FillType': 'FILL',
+            'OrderType': self.random.choice(('BUY', 'SELL')),
+        } for index in range(count)]
+
+    def _depth(self, params):
+        return min(int(params.get('depth', 50)), self.depth)
+
+    def _count(self, params):
+        return min(int(params.get('count', 50)), self.history)
+
+    def _market(self, params):
+        market = params.get('market', 'usd-btc').lower()
+        return market if market in self.prices else 'usd-btc'
+
+    # public calls
+
+    def call_getmarkets(self, params):
+        return [{
+            'MarketCurrency': market.split('-')[0].upper(), 'BaseCurrency': 'BTC',
+            'MarketCurrencyLong': market.split('-')[0].upper(), 'BaseCurrencyLong': 'Bitcoin',
+            'MinTradeSize': 0.01, 'MarketName': market.upper(), 'IsActive': True,
+            'Created': '2014-01-01T00:00:00',
+        } for market in self.markets]
+
+    def call_getorderbook(self, params):
+        market, depth, book_type = self._market(params), self._depth(params), params.get('type', 'both')
+        return dict((side, self.levels(market, depth, side)) for side in ('buy', 'sell')
+                    if book_type in (side, 'both'))
+
+    def call_getfullorderbook(self, params):
+        depth = self._depth(params)
+        return dict((side, [dict(level, Market=market) for market in self.markets
+                            for level in self.levels(market, depth, side)]) for side in ('buy', 'sell'))
+
+    def call_getmarketsummaries(self, params):
+        summaries = []
+        for market in self.markets:
+            price = self.prices[market]
+            summaries.append({
+                'MarketName': market.upper(), 'High': price * 1.05, 'Low': price * 0.95,
+                'Volume': self.random.uniform(0, 1000), 'Last': price, 'BaseVolume': self.random.uniform(0, 10),
+                'TimeStamp': str(TIMESTAMP), 'Bid': price * 0.998, 'Ask': price * 1.002,
+                'OpenBuyOrders': self.random.randint(0, 100), 'OpenSellOrders': self.random.randint(0, 100),
+                'PrevDay': price, 'Created': str(TIMESTAMP), 'DisplayMarketName': None,
+            })
+        return summaries
+
+    def call_getmarkethistory(self, params):
+        return self.trades(self._market(params), self._count(params))
+
+    def call_getfullmarkethistory(self, params):
+        count = self._count(params)
+        return [dict(trade, Market=market) for market in self.markets for trade in self.trades(market, count)]
+
+    def call_getbalancedistribution(self, params):
+        return {'Distribution': [{'Balance': self.random.uniform(0, 1e6)} for _ in range(100)]}
+
+    # private calls
+
+    def balance(self, currency):
+        return {
+            'Currency': currency.upper(), 'Balance': self.random.uniform(0, 100),
+            'Available': self.random.uniform(0, 10), 'Pending': 0.0,
+            'CryptoAddress': '1Euo2hfrw9cSWZGstPcRwDaHtcvL8iyJXP', 'Requested': False, 'Uuid': None,
+        }
+
+    def order(self, index, market):
+        price = self.prices[market]
+        return {
+            'Uuid': None, 'OrderUuid': str(2000000 + index), 'Exchange': market.upper(),
+            'OrderType': ('LIMIT_BUY', 'LIMIT_SELL')[index % 2], 'Quantity': 200.0, 'QuantityRemaining': 200.0,
+            'Limit': price, 'CommissionPaid': 0.0, 'Price': 0.0, 'PricePerUnit': None,
+            'Opened': '2016-03-31 08:00:00', 'Closed': None, 'CancelInitiated': False,
+            'ImmediateOrCancel': False, 'IsConditional': False, 'Condition': 'NONE', 'ConditionTarget': None,
+        }
+
+    def call_buylimit(self, params):
+        return {'uuid': str(self.random.randint(1, 10 ** 9))}
+
+    call_selllimit = call_buylimit
+
+    def call_cancel(self, params):
+        return None
+
+    def call_getbalance(self, params):
+        return self.balance(params.get('currency', 'btc'))
+
+    def call_getbalances(self, params):
+        return [self.balance(market.split('-')[0]) for market in self.markets]
+
+    def call_getopenorders(self, params):
+        if 'market' in params:
+            return [self.order(index, self._market(params)) for index in range(self.orders)]
+        return [self.order(index, self.markets[index % len(self.markets)]) for index in range(self.orders)]
+
+    def call_getorder(self, params):
+        return [dict(self.order(0, 'usd-btc'), OrderUuid=params.get('uuid'), IsOpen=True)]
+
+    def call_getorderhistory(self, params):
+        return [self.order(index, self._market(params)) for index in range(self._count(params))]
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+def handler(payloads, private_path='api.html'):
+    """
+    Returns:
+        type: request handler class serving `payloads`
+    """
+    class MockCCexHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # headers and body are written separately, do not let them wait for a delayed ACK
+        disable_nagle_algorithm = True
+
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path.endswith(private_path) and not self.headers.get('apisign'):
+                body = json.dumps({'success': False, 'message': 'APISIGN_NOT_PROVIDED', 'result': None})
+                self.respond(200, body.encode('utf-8'))
+                return
+
+            body = payloads.body(url.path, parse_qs(url.query))
+            if body is None:
+                self.respond(404, b'Not found')
+            else:
+                self.respond(200, body)
+
+        def respond(self, status, body):
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return MockCCexHandler
+
+
+def serve(host='127.0.0.1', port=0, ready=None, **options):
+    """
+    Serve the mock API forever.
+
+    Args:
+        host (str): Listening address
+        port (int): Listening port, 0 for any free one
+        ready (callable, optional): Called with the listening port once the server is up
+        **options: `Payloads` options
+    """
+    server = ThreadingHTTPServer((host, port), handler(Payloads(**options)))
+    if ready is not None:
+        ready(server.server_address[1])
+    server.serve_forever()
+
+
+class MockCCexServer(object):
+    """
+    Mock API running in a child process, so it does not compete with the measured client for the GIL.
+
+    Examples::
+
+            with MockCCexServer(markets=500, depth=100) as server:
+                ccex = CCexAPI(api_url=server.url)
+
+    """
+
+    def __init__(self, host='127.0.0.1', **options):
+        """
+        Args:
+            host (str): Listening address
+            **options: `Payloads` options
+        """
+        self.host = host
+        self.options = options
+        self.process = None
+        self.url = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        ports = multiprocessing.Queue()
+        self.process = multiprocessing.Process(
+            target=serve, args=(self.host, 0, ports.put), kwargs=self.options)
+        self.process.daemon = True
+        self.process.start()
+        self.url = 'http://{}:{}/t'.format(self.host, ports.get(timeout=30))
+
+    def stop(self):
+        if self.process is not None:
+            self.process.terminate()
+            self.process.join()
+            self.process = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--markets', type=int, default=500, help='number of markets')
+    parser.add_argument('--depth', type=int, default=100, help='maximum order book depth')
+    parser.add_argument('--history', type=int, default=100, help='maximum number of trades per market')
+    parser.add_argument('--orders', type=int, default=20, help='number of open orders')
+    args = parser.parse_args(argv)
+
+    def ready(port):
+        print('Serving mock C-Cex API on http://{}:{}/t'.format(args.host, port))
+        sys.stdout.flush()
+
+    serve(args.host, args.port, ready,
+          markets=args.markets, depth=args.depth, history=args.history, orders=args.orders)
+
+
+if __name__ == '__main__':
+    main()
@@ -17,4 +17,43 @@
   0. You just DO WHAT THE FUCK YOU WANT TO.
 """
 
-from ccex import *
\ No newline at end of file
+import sys
+
+from .ccex import *
+from .arbitrage import *
+from .cache import *
+from .orderbook import *
+from .metrics import *
+from .orders import *
+from .poller import *
+from .ratelimit import *
+from .records import *
+from .replay import *
+from .retry import *
+from .scheduler import *
+from .snapshots import *
+
+_ASYNC_NAMES = ('AsyncCCexAPI', 'AsyncCCexAPITickers', 'AsyncCCexAPIPublic', 'AsyncCCexAPIPrivate',
+                'AsyncCCexAPITransport')
+
+__all__ = [name for module in (ccex, arbitrage, cache, orderbook, metrics, orders, poller, ratelimit, records, replay,
+                               retry, scheduler, snapshots)
+           for name in module.__all__]
+if sys.version_info >= (3, 5):
+    __all__.extend(_ASYNC_NAMES)
+
+if sys.version_info >= (3, 7):
+    def __getattr__(name):
+        """
+        Import the asyncio client on first use, `asyncio` is slow to import.
+        """
+        if name in _ASYNC_NAMES:
+            from . import aio
+            return getattr(aio, name)
+        raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+    def __dir__():
+        return sorted(list(globals()) + list(_ASYNC_NAMES))
+
+elif sys.version_info >= (3, 5):
+    from .aio import *
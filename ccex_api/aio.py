@@ -0,0 +1,400 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+           DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+                    Version 2, December 2004
+
+ Copyright (C) 2004 Sam Hocevar <sam@hocevar.net>
+
+ Everyone is permitted to copy and distribute verbatim or modified
+ copies of this license document, and changing it is allowed as long
+ as the name is changed.
+
+            DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+   TERMS AND CONDITIONS FOR COPYING, DISTRIBUTION AND MODIFICATION
+
+  0. You just DO WHAT THE FUCK YOU WANT TO.
+"""
+
+import codecs
+import asyncio
+
+from time import perf_counter
+from collections import OrderedDict
+
+from .ccex import (CCexAPI, CCexAPIGroup, CCexAPITickers, CCexAPIPublic, CCexAPIPrivate,
+                   CCexAPIBatchResult, CCexAPIError, CCexAPIRequestError, CCexAPIStreamDecoder, TRANSIENT_ERRORS)
+from .cache import _MISSING
+
+
+class AsyncCCexAPITransport(object):
+    """
+    Non-blocking HTTP transport, shared by every endpoint group of an `AsyncCCexAPI`.
+    The underlying `aiohttp` session is created on first use, inside the running loop.
+    """
+
+    def __init__(self, limit=100, limit_per_host=0):
+        """
+        Args:
+            limit (int): Maximum number of simultaneous connections
+            limit_per_host (int): Maximum number of simultaneous connections to the same host, 0 for no limit
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.session = None
+
+    def _get_session(self):
+        if self.session is None:
+            try:
+                import aiohttp
+            except ImportError:
+                raise CCexAPIError('AsyncCCexAPI requires the `aiohttp` package')
+
+            self.session = aiohttp.ClientSession(
+                headers={'User-Agent': 'CCEX_API_WRAPPER'},
+                connector=aiohttp.TCPConnector(limit=self.limit, limit_per_host=self.limit_per_host)
+            )
+        return self.session
+
+    async def send(self, request):
+        """
+        Send a request.
+
+        Args:
+            request (CCexAPIRequest): request built by `CCexAPI._prepare_request`
+
+        Returns:
+            tuple(aiohttp.ClientResponse, bytes): response and its body
+        """
+        async with self._get_session().get(request.url, headers=request.headers) as res:
+            return res, await res.read()
+
+    def open(self, request):
+        """
+        Send a request, without downloading the response body.
+
+        Returns:
+            aiohttp.client._RequestContextManager: context manager of the response
+        """
+        return self._get_session().get(request.url, headers=request.headers)
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+
+class AsyncCCexAPI(CCexAPI):
+    """
+    CCex API asyncio client, endpoints methods are the same as `CCexAPI` ones but return coroutines.
+
+    Examples::
+
+            async with AsyncCCexAPI() as ccex:
+                await ccex.public.get_market_summaries()
+
+                pairs = await ccex.tickers.tickers_pairs()
+                tickers = await ccex.gather(
+                    (ccex.tickers.tickers_pair_market_data(*pair.split('-')) for pair in pairs),
+                    limit=50
+                )
+
+    """
+
+    tickers = CCexAPIGroup('tickers', 'AsyncCCexAPITickers', __name__)
+    """ Tickers endpoints"""
+    public = CCexAPIGroup('public', 'AsyncCCexAPIPublic', __name__)
+    """ Public endpoints"""
+    private = CCexAPIGroup('private', 'AsyncCCexAPIPrivate', __name__, authenticated=True)
+    """ Private endpoints"""
+
+    def __init__(self, api_key=None, api_secret=None, api_url=None, transport=None, **kwargs):
+        """
+        `AsyncCCexAPI` offers the same three attribute representing group of endpoints as `CCexAPI`,
+        they all share the same transport, nonce source and cache.
+
+        Args:
+            api_key (str, optional): Your API key
+            api_secret (str, optional): Your API private secret
+            api_url (str, optional): Override the API base url (ex: a local stub server)
+            transport (AsyncCCexAPITransport, optional): Transport to send requests with
+            **kwargs: Other `CCexAPI` options
+        """
+        super(AsyncCCexAPI, self).__init__(
+            api_key,
+            api_secret,
+            api_url,
+            transport=transport or AsyncCCexAPITransport(),
+            **kwargs)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    @property
+    def session(self):
+        """
+        `aiohttp.ClientSession` of the shared transport, `None` until the first call.
+        """
+        return self.transport.session
+
+    async def close(self):
+        """
+        Close the underlying transport.
+        """
+        await self.transport.close()
+
+    @staticmethod
+    async def gather(calls, limit=10, return_exceptions=False):
+        """
+        Run endpoints calls concurrently, with at most `limit` of them in flight.
+
+        Args:
+            calls (iterable): Awaitables as returned by endpoints methods
+            limit (int): Maximum number of concurrent calls
+            return_exceptions (bool): Return errors in place of results instead of raising the first one
+
+        Returns:
+            list: results in the same order as `calls`
+        """
+        semaphore = asyncio.Semaphore(limit)
+
+        async def limited(call):
+            async with semaphore:
+                return await call
+
+        return await asyncio.gather(*[limited(call) for call in calls], return_exceptions=return_exceptions)
+
+    async def _call(self, call, path, params=None, headers=None, authenticated=False, key=None, typed=None):
+        try:
+            if self.cache is not None and not authenticated:
+                result = await self._cached(call, path, params, headers, key)
+            else:
+                result = (await self._load(call, path, params, headers, authenticated, key))[0]
+
+            if typed is not None and self.typed:
+                return typed(result)
+            return result
+
+        except CCexAPIError:
+            raise
+        except Exception as exc:
+            raise CCexAPIError('Unexpected error during CCex API call: {}'.format(repr(exc)))
+
+    async def _acquire(self, path, authenticated):
+        """
+        `CCexAPIRateLimiter.acquire` counterpart, waiting without blocking the loop.
+        """
+        ticket = self.limiter.enqueue(self._kind(path, authenticated))
+        try:
+            while True:
+                wait = self.limiter.poll(ticket)
+                if not wait:
+                    return
+                await asyncio.sleep(wait)
+        except BaseException:
+            self.limiter.cancel(ticket)
+            raise
+
+    async def _load(self, call, path, params, headers, authenticated, key):
+        delays = iter(()) if self.retry is None or authenticated else self.retry.delays()
+        while True:
+            probe = self.breaker.before() if self.breaker is not None else False
+
+            try:
+                loaded = await self._send(call, path, params, headers, authenticated, key)
+            except TRANSIENT_ERRORS as exc:
+                if self.breaker is not None and self.breaker.failure(exc):
+                    raise
+                delay = next(delays, None)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            except Exception:
+                if self.breaker is not None:
+                    self.breaker.success()
+                raise
+            except BaseException:
+                if self.breaker is not None:
+                    self.breaker.cancel(probe)
+                raise
+
+            if self.breaker is not None:
+                self.breaker.success()
+            return loaded
+
+    async def _send(self, call, path, params, headers, authenticated, key):
+        started = perf_counter()
+        if self.limiter is not None:
+            await self._acquire(path, authenticated)
+        acquired = perf_counter()
+        prep_req = self._prepare_request(call, path, dict(params or {}), headers, authenticated)
+        prepared = perf_counter()
+        spans = {'limiter': acquired - started, 'prepare': prepared - acquired}
+        size = error = None
+
+        try:
+            try:
+                res, body = await self.transport.send(prep_req)
+            except CCexAPIError:
+                raise
+            except Exception as exc:
+                raise CCexAPIRequestError(prep_req, exc)
+
+            size = len(body)
+            received = perf_counter()
+            spans['transport'] = received - prepared
+
+            result = self._parse_response(res, body, path, key)
+            spans['parse'] = perf_counter() - received
+            return result, size
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            if self.hooks:
+                self._record(call, spans, started, size, error)
+
+    async def _stream(self, call, path, params=None, headers=None, authenticated=False, key=None, typed=None):
+        """
+        Asynchronous generator counterpart of `CCexAPI._stream`.
+        Chunks are decoded as they are received, between reads of the response,
+        so the whole result is never materialized.
+        """
+        probe = self.breaker.before() if self.breaker is not None else False
+        try:
+            if self.limiter is not None:
+                await self._acquire(path, authenticated)
+            prep_req = self._prepare_request(call, path, dict(params or {}), headers, authenticated)
+
+            try:
+                async with self.transport.open(prep_req) as res:
+                    text = codecs.getincrementaldecoder('utf-8')('replace')
+                    decoder = CCexAPIStreamDecoder(res)
+                    async for chunk in res.content.iter_chunked(self.STREAM_CHUNK_SIZE):
+                        for record in decoder.feed(text.decode(chunk)):
+                            yield record
+                        if decoder.done:
+                            break
+                    for record in decoder.feed(text.decode(b'', True)) + decoder.close():
+                        yield record
+            except CCexAPIError:
+                raise
+            except Exception as exc:
+                raise CCexAPIRequestError(prep_req, exc)
+        except TRANSIENT_ERRORS as exc:
+            if self.breaker is not None:
+                self.breaker.failure(exc)
+            raise
+        except Exception:
+            if self.breaker is not None:
+                self.breaker.success()
+            raise
+        except BaseException:
+            if self.breaker is not None:
+                self.breaker.cancel(probe)
+            raise
+        if self.breaker is not None:
+            self.breaker.success()
+
+    # noinspection PyProtectedMember
+    async def _cached(self, call, path, params, headers, key):
+        """
+        `CCexAPICache.get` counterpart, concurrent misses wait on the same future.
+        """
+        cache = self.cache
+        ttl = cache.ttl(call, path)
+        if not ttl:
+            return (await self._load(call, path, params, headers, False, key))[0]
+
+        cache_key = cache.key(call, path, params, key)
+        with cache.lock:
+            entry = cache._lookup(cache_key)
+            if entry is not _MISSING:
+                return entry
+            flight = cache.async_flights.get(cache_key)
+            if flight is not None:
+                cache.coalesced += 1
+            else:
+                cache.misses += 1
+                cache.async_flights[cache_key] = asyncio.get_event_loop().create_future()
+
+        if flight is not None:
+            try:
+                return await asyncio.shield(flight)
+            except asyncio.CancelledError:
+                if not flight.cancelled():
+                    raise
+                # the leader was cancelled, load it again
+                return await self._cached(call, path, params, headers, key)
+
+        flight = cache.async_flights[cache_key]
+        try:
+            value, size = await self._load(call, path, params, headers, False, key)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            flight.set_exception(exc)
+            # retrieve it, so it is not reported when nobody else was waiting
+            flight.exception()
+            raise
+        else:
+            flight.set_result(value)
+            with cache.lock:
+                cache._store(cache_key, value, size, ttl)
+        finally:
+            with cache.lock:
+                del cache.async_flights[cache_key]
+            if not flight.done():
+                # cancelled or interrupted, waiters must not hang on it
+                flight.cancel()
+
+        return value
+
+
+class AsyncCCexAPITickers(AsyncCCexAPI, CCexAPITickers):
+    """
+    Tickers endpoints
+    """
+
+    async def tickers_all_pairs_changes(self):
+        return self._ticker_changes(await self.tickers_all_pairs_market_data())
+
+
+class AsyncCCexAPIPublic(AsyncCCexAPI, CCexAPIPublic):
+    """
+    Public endpoints
+    """
+
+
+class AsyncCCexAPIPrivate(AsyncCCexAPI, CCexAPIPrivate):
+    """
+    Private endpoints
+    """
+    def __init__(self, api_key, api_secret, **kwargs):
+        super(AsyncCCexAPIPrivate, self).__init__(api_key, api_secret, **kwargs)
+
+    async def _batch(self, method, items, workers=None):
+        """
+        `CCexAPIPrivate._batch` counterpart, calls are run as coroutines, at most `workers` of them in flight.
+        """
+        items = list(OrderedDict.fromkeys(items))
+        results = CCexAPIBatchResult()
+        outcomes = await self.gather(
+            (method(item) for item in items), limit=workers or self.BATCH_WORKERS, return_exceptions=True)
+        for item, outcome in zip(items, outcomes):
+            if isinstance(outcome, CCexAPIError):
+                results.errors[item] = outcome
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                results[item] = outcome
+        return results
+
+
+__all__ = ['AsyncCCexAPI', 'AsyncCCexAPITickers', 'AsyncCCexAPIPublic', 'AsyncCCexAPIPrivate',
+           'AsyncCCexAPITransport']
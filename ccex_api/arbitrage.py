@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+           DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+                    Version 2, December 2004
+
+ Copyright (C) 2004 Sam Hocevar <sam@hocevar.net>
+
+ Everyone is permitted to copy and distribute verbatim or modified
+ copies of this license document, and changing it is allowed as long
+ as the name is changed.
+
+            DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+   TERMS AND CONDITIONS FOR COPYING, DISTRIBUTION AND MODIFICATION
+
+  0. You just DO WHAT THE FUCK YOU WANT TO.
+"""
+
+import heapq
+
+from array import array
+from collections import namedtuple
+
+from .orderbook import numpy
+from .snapshots import TickerSnapshot
+
+
+class Triangle(namedtuple('Triangle', ('currencies', 'rates', 'rate'))):
+    """
+    Three currencies cycle: trading the first currency for the second, then the third, then back to the first.
+    `rates` are the rates of each leg, `rate` their product, above 1 when the cycle is profitable.
+    """
+    __slots__ = ()
+
+    @property
+    def profit(self):
+        """
+        Returns:
+            float: relative gain of one cycle, negative for a loss
+        """
+        return self.rate - 1
+
+
+class CrossRates(object):
+    """
+    Dense currency by currency matrix of the rates of one tickers snapshot.
+
+    `rates[i][j]` is the amount of currency `j` obtained for one unit of currency `i`, trading at the best bid
+    (pair `i-j`) or ask (pair `j-i`), fees deduced. It is 0 when the currencies are not traded together.
+    The matrix is a 2D NumPy array when available, a list of `array('d')` rows otherwise.
+
+    Examples::
+
+            rates = CrossRates.from_prices(ccex.tickers.tickers_all_pairs_market_data(), fee=0.002)
+            rates.rate('ltc', 'btc')
+            for triangle in rates.triangles(top=5, min_rate=1.0):
+                ...
+
+    """
+
+    def __init__(self, currencies, rates):
+        """
+        Args:
+            currencies (list(str)): Currencies names, lower cased, in matrix order
+            rates (array): Square rates matrix
+        """
+        self.currencies = currencies
+        self.index = dict((currency, row) for row, currency in enumerate(currencies))
+        self.rates = rates
+
+    @classmethod
+    def from_prices(cls, result, fee=0.0):
+        """
+        Build the matrix of a `tickers_all_pairs_market_data` result, raw or typed.
+
+        Args:
+            result (dict): Tickers by pair name
+            fee (float): Fee ratio deduced from each trade
+        """
+        return cls.from_snapshot(TickerSnapshot.from_prices(result), fee)
+
+    @classmethod
+    def from_snapshot(cls, snapshot, fee=0.0):
+        """
+        Args:
+            snapshot (TickerSnapshot): Tickers snapshot, `buy` and `sell` columns are used
+            fee (float): Fee ratio deduced from each trade
+        """
+        currencies = sorted(set(currency for pair in snapshot.pairs for currency in pair.split('-', 1)))
+        index = dict((currency, row) for row, currency in enumerate(currencies))
+        size = len(currencies)
+        sources = [index[pair.split('-', 1)[0]] for pair in snapshot.pairs]
+        targets = [index[pair.split('-', 1)[1]] for pair in snapshot.pairs]
+        bids, asks = snapshot.column('buy'), snapshot.column('sell')
+        keep = 1.0 - fee
+
+        np = numpy()
+        if np is not None:
+            rates = np.zeros((size, size))
+            sources, targets = np.array(sources, dtype=np.intp), np.array(targets, dtype=np.intp)
+            bids, asks = np.asarray(bids, dtype=np.float64), np.asarray(asks, dtype=np.float64)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                sold = bids > 0
+                bought = asks > 0
+                rates[sources[sold], targets[sold]] = bids[sold] * keep
+                rates[targets[bought], sources[bought]] = keep / asks[bought]
+            return cls(currencies, rates)
+
+        rates = [array('d', [0.0]) * size for _ in range(size)]
+        for source, target, bid, ask in zip(sources, targets, bids, asks):
+            if bid > 0:
+                rates[source][target] = bid * keep
+            if ask > 0:
+                rates[target][source] = keep / ask
+        return cls(currencies, rates)
+
+    def __repr__(self):
+        return '<CrossRates currencies={}>'.format(len(self.currencies))
+
+    def __len__(self):
+        return len(self.currencies)
+
+    def rate(self, source, target):
+        """
+        Returns:
+            float: amount of `target` obtained for one `source` by a direct trade, 0 when not traded
+        """
+        return float(self.rates[self.index[source.lower()]][self.index[target.lower()]])
+
+    def implied(self, source, target):
+        """
+        Best cross rate through one intermediate currency.
+
+        Returns:
+            tuple(float, str): amount of `target` obtained for one `source`, and the intermediate currency.
+                `(0.0, None)` when there is no such path.
+        """
+        source, target = self.index[source.lower()], self.index[target.lower()]
+        np = numpy()
+        if np is not None:
+            cross = self.rates[source, :] * self.rates[:, target]
+            via = int(cross.argmax())
+            rate = float(cross[via])
+        else:
+            rate, via = max((self.rates[source][via] * self.rates[via][target], via)
+                            for via in range(len(self.currencies)))
+        return (rate, self.currencies[via]) if rate > 0 else (0.0, None)
+
+    def triangles(self, top=10, min_rate=None):
+        """
+        Scan all the three currencies cycles, each one once per direction.
+
+        Args:
+            top (int): Maximum number of cycles returned
+            min_rate (float, optional): Ignore cycles with a lower rate (ex: 1.0 for profitable ones only)
+
+        Returns:
+            list(Triangle): best cycles first
+        """
+        found = self._triangles_numpy(top, min_rate) if numpy() is not None else self._triangles(top, min_rate)
+        currencies = self.currencies
+        return [Triangle((currencies[i], currencies[j], currencies[k]), legs, rate)
+                for rate, i, j, k, legs in heapq.nlargest(top, found)]
+
+    def _triangles_numpy(self, top, min_rate, chunk=1 << 20):
+        np = numpy()
+        rates = self.rates
+        # a currency can only be part of a cycle if it can be both sold for and bought with another one
+        traded = rates > 0
+        active = np.flatnonzero(traded.any(axis=1) & traded.any(axis=0))
+        sub = rates[np.ix_(active, active)]
+        size = len(active)
+        # cycles are rooted at their smallest currency, so that each is scanned once per direction:
+        # first legs i -> j with i < j, then all the k > i closing the cycle, by batches of first legs
+        firsts, seconds = np.nonzero(np.triu(sub > 0, 1))
+        thirds = np.arange(size)
+        batch = max(1, chunk // max(size, 1))
+        found = []
+        for start in range(0, len(firsts), batch):
+            i, j = firsts[start:start + batch], seconds[start:start + batch]
+            cycles = sub[i, j][:, None] * sub[j, :] * sub[:, i].T
+            kept = (cycles > 0) & (thirds[None, :] > i[:, None])
+            if min_rate is not None:
+                kept &= cycles >= min_rate
+            candidates = np.flatnonzero(kept)
+            if len(candidates) > top:
+                candidates = candidates[np.argpartition(cycles.ravel()[candidates], -top)[-top:]]
+            for candidate in candidates.tolist():
+                edge, k = divmod(candidate, size)
+                first, second = int(i[edge]), int(j[edge])
+                legs = (float(sub[first, second]), float(sub[second, k]), float(sub[k, first]))
+                found.append((float(cycles[edge, k]), int(active[first]), int(active[second]), int(active[k]), legs))
+        return found
+
+    def _triangles(self, top, min_rate):
+        rates = self.rates
+        size = len(self.currencies)
+        edges = [[target for target in range(size) if row[target] > 0] for row in rates]
+        found = []
+        for i in range(size):
+            row = rates[i]
+            for j in edges[i]:
+                if j <= i:
+                    continue
+                for k in edges[j]:
+                    if k <= i or k == j or not rates[k][i] > 0:
+                        continue
+                    legs = (row[j], rates[j][k], rates[k][i])
+                    rate = legs[0] * legs[1] * legs[2]
+                    if min_rate is None or rate >= min_rate:
+                        found.append((rate, i, j, k, legs))
+        return found
+
+
+__all__ = ['CrossRates', 'Triangle']
@@ -0,0 +1,388 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+           DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+                    Version 2, December 2004
+
+ Copyright (C) 2004 Sam Hocevar <sam@hocevar.net>
+
+ Everyone is permitted to copy and distribute verbatim or modified
+ copies of this license document, and changing it is allowed as long
+ as the name is changed.
+
+            DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+   TERMS AND CONDITIONS FOR COPYING, DISTRIBUTION AND MODIFICATION
+
+  0. You just DO WHAT THE FUCK YOU WANT TO.
+"""
+
+import json
+import threading
+
+from time import time, sleep
+from collections import OrderedDict
+
+from .ccex import CCexAPIError
+
+
+_MISSING = object()
+
+
+class _Flight(object):
+    """
+    A load in progress, other callers of the same key wait for its outcome.
+    """
+    __slots__ = ('event', 'value', 'error')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class CCexAPICache(object):
+    """
+    In-process TTL cache of tickers and public calls results.
+
+    Entries are evicted in least recently used order once there are more than `max_entries`
+    of them or they weight more than `max_bytes` (size of the response bodies).
+    Concurrent misses of the same call are coalesced: only one request is sent,
+    and the other callers get its result.
+    Authenticated calls are never cached.
+
+    Results are shared between callers, they must not be modified in place.
+
+    Examples::
+
+            cache = CCexAPICache(ttls={'prices.json': 2, 'getmarketsummaries': 10})
+            ccex = CCexAPI(cache=cache)
+            ccex.tickers.tickers_all_pairs_market_data()
+            cache.stats()
+
+    """
+
+    TTLS = {
+        'coinnames.json': 3600,
+        'pairs.json': 300,
+        'getmarkets': 300,
+    }
+    """ Default TTLs, in seconds, by path or call name"""
+
+    def __init__(self, ttls=None, default_ttl=1, max_entries=1024, max_bytes=64 * 1024 * 1024):
+        """
+        Args:
+            ttls (dict(str, float), optional): TTLs in seconds by path (ex: `prices.json`)
+                or call name (ex: `getmarkets`), merged with `TTLS`. A TTL of 0 disables caching.
+            default_ttl (float): TTL of the calls not listed in `ttls`
+            max_entries (int): Maximum number of entries
+            max_bytes (int): Maximum total size of the cached responses
+        """
+        self.ttls = dict(self.TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.flights = {}
+        self.async_flights = {}
+        """ In progress loads of `AsyncCCexAPI` calls"""
+        self.bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def ttl(self, call, path):
+        """
+        Returns:
+            float: TTL of a call, in seconds
+        """
+        return self.ttls.get(path, self.ttls.get(call, self.default_ttl))
+
+    @staticmethod
+    def key(call, path, params, key):
+        """
+        Returns:
+            tuple: cache key of a call
+        """
+        return call, path, tuple(sorted((params or {}).items())), key
+
+    def stats(self):
+        """
+        Returns:
+            dict: counters and current size of the cache
+        """
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'bytes': self.bytes,
+            }
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.bytes = 0
+
+    def get(self, call, path, params, key, loader):
+        """
+        Get a call result from the cache, or load it.
+
+        Args:
+            call (str): Call name
+            path (str): Call path
+            params (dict): Call parameters
+            key (str): Result key
+            loader (callable): Send the call, returns its result and response size
+
+        Returns:
+            object: call result
+        """
+        ttl = self.ttl(call, path)
+        if not ttl:
+            return loader()[0]
+
+        cache_key = self.key(call, path, params, key)
+        with self.lock:
+            entry = self._lookup(cache_key)
+            if entry is not _MISSING:
+                return entry
+            flight = self.flights.get(cache_key)
+            leader = flight is None
+            if leader:
+                flight = self.flights[cache_key] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value, size = loader()
+            flight.value = value
+        except Exception as exc:
+            flight.error = exc
+            raise
+        except BaseException as exc:
+            # interrupted leader, waiters must not mistake it for a `None` result
+            flight.error = CCexAPIError('Coalesced call interrupted: {!r}'.format(exc))
+            raise
+        else:
+            with self.lock:
+                self._store(cache_key, value, size, ttl)
+        finally:
+            with self.lock:
+                del self.flights[cache_key]
+            flight.event.set()
+
+        return value
+
+    def _lookup(self, cache_key):
+        entry = self.entries.get(cache_key)
+        if entry is None:
+            return _MISSING
+
+        expires, value, size = entry
+        if expires < time():
+            del self.entries[cache_key]
+            self.bytes -= size
+            return _MISSING
+
+        # most recently used entries are kept at the end
+        self.entries[cache_key] = self.entries.pop(cache_key)
+        self.hits += 1
+        return value
+
+    def _store(self, cache_key, value, size, ttl):
+        previous = self.entries.pop(cache_key, None)
+        if previous is not None:
+            self.bytes -= previous[2]
+
+        if size > self.max_bytes:
+            return
+
+        self.entries[cache_key] = (time() + ttl, value, size)
+        self.bytes += size
+        while len(self.entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self.entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+
+class CCexAPISharedCache(CCexAPICache):
+    """
+    TTL cache shared by all processes of a host, backed by a SQLite database in WAL mode.
+
+    The first process to miss an entry takes a lease on it and refreshes it, the other
+    ones keep being served the previous value while it is at most `max_stale` seconds
+    old, or wait for the refresh otherwise.
+    In WAL mode readers never wait for the writer, reading a fresh entry is a single query.
+
+    Entries are evicted oldest first once there are more than `max_entries` of them,
+    so that reads do not need to write their access time.
+    Results are stored as JSON.
+
+    Examples::
+
+            # in every strategy process
+            cache = CCexAPISharedCache('/dev/shm/ccex.sqlite', ttls={'prices.json': 2})
+            ccex = CCexAPI(cache=cache)
+            ccex.tickers.tickers_all_pairs_market_data()
+            cache.snapshot('ticker', 'prices.json')['age']
+
+    """
+
+    def __init__(self, path, ttls=None, default_ttl=1, max_entries=1024, max_stale=60, lease=10,
+                 poll_interval=0.01):
+        """
+        Args:
+            path (str): SQLite database path, the same for all processes
+            ttls (dict(str, float), optional): see `CCexAPICache`
+            default_ttl (float): TTL of the calls not listed in `ttls`
+            max_entries (int): Maximum number of entries
+            max_stale (float): Seconds an expired entry can still be served while another process refreshes it
+            lease (float): Seconds after which a refresh is considered failed, and taken over
+            poll_interval (float): Seconds between two reads while waiting for another process refresh
+        """
+        super(CCexAPISharedCache, self).__init__(ttls, default_ttl, max_entries)
+        self.path = path
+        self.max_stale = max_stale
+        self.lease = lease
+        self.poll_interval = poll_interval
+        self.local = threading.local()
+
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS entries ('
+            ' key TEXT PRIMARY KEY, value TEXT, size INTEGER,'
+            ' fetched REAL, expires REAL, lease REAL NOT NULL DEFAULT 0)')
+
+    def _connection(self):
+        # sqlite connections can not be shared between threads
+        connection = getattr(self.local, 'connection', None)
+        if connection is None:
+            import sqlite3
+
+            connection = sqlite3.connect(self.path, timeout=self.lease, isolation_level=None)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self.local.connection = connection
+        return connection
+
+    def _read(self, db_key):
+        return self._connection().execute(
+            'SELECT value, fetched, expires FROM entries WHERE key = ? AND value IS NOT NULL',
+            (db_key,)
+        ).fetchone()
+
+    def _acquire(self, db_key):
+        """
+        Take the refresh lease of an entry.
+
+        Returns:
+            bool: whether this process has to refresh the entry
+        """
+        now = time()
+        connection = self._connection()
+        connection.execute('INSERT OR IGNORE INTO entries (key) VALUES (?)', (db_key,))
+        return connection.execute(
+            'UPDATE entries SET lease = ? WHERE key = ? AND lease < ?',
+            (now + self.lease, db_key, now)
+        ).rowcount == 1
+
+    def _release(self, db_key):
+        self._connection().execute('UPDATE entries SET lease = 0 WHERE key = ?', (db_key,))
+
+    def stats(self):
+        stats = super(CCexAPISharedCache, self).stats()
+        stats['entries'], stats['bytes'] = self._connection().execute(
+            'SELECT count(*), coalesce(sum(size), 0) FROM entries WHERE value IS NOT NULL').fetchone()
+        return stats
+
+    def clear(self):
+        self._connection().execute('DELETE FROM entries')
+
+    def snapshot(self, call, path, params=None, key=None):
+        """
+        Read a cached result and its staleness, without ever querying the API.
+
+        Returns:
+            dict: `value`, `fetched` time, `age` and `stale` flag, or `None` when not cached
+        """
+        row = self._read(self._db_key(self.key(call, path, params, key)))
+        if row is None:
+            return None
+
+        value, fetched, expires = row
+        now = time()
+        return {
+            'value': json.loads(value),
+            'fetched': fetched,
+            'age': now - fetched,
+            'stale': expires < now,
+        }
+
+    def get(self, call, path, params, key, loader):
+        ttl = self.ttl(call, path)
+        if not ttl:
+            return loader()[0]
+
+        db_key = self._db_key(self.key(call, path, params, key))
+        while True:
+            row = self._read(db_key)
+            now = time()
+            if row is not None and row[2] >= now:
+                self.hits += 1
+                return json.loads(row[0])
+
+            if self._acquire(db_key):
+                self.misses += 1
+                try:
+                    value, size = loader()
+                except Exception:
+                    self._release(db_key)
+                    raise
+                self._write(db_key, value, size, ttl)
+                return value
+
+            # another process is refreshing it
+            if row is not None and now - row[2] <= self.max_stale:
+                self.coalesced += 1
+                return json.loads(row[0])
+            sleep(self.poll_interval)
+
+    def _lookup(self, cache_key):
+        row = self._read(self._db_key(cache_key))
+        if row is None or row[2] < time():
+            return _MISSING
+        self.hits += 1
+        return json.loads(row[0])
+
+    def _store(self, cache_key, value, size, ttl):
+        self._write(self._db_key(cache_key), value, size, ttl)
+
+    def _write(self, db_key, value, size, ttl):
+        now = time()
+        connection = self._connection()
+        connection.execute(
+            'INSERT OR REPLACE INTO entries (key, value, size, fetched, expires, lease) VALUES (?, ?, ?, ?, ?, 0)',
+            (db_key, json.dumps(value), size, now, now + ttl))
+        connection.execute(
+            'DELETE FROM entries WHERE key NOT IN (SELECT key FROM entries ORDER BY fetched DESC LIMIT ?)',
+            (self.max_entries,))
+
+    @staticmethod
+    def _db_key(cache_key):
+        return json.dumps(cache_key)
+
+
+__all__ = ['CCexAPICache', 'CCexAPISharedCache']
@@ -17,11 +17,36 @@
   0. You just DO WHAT THE FUCK YOU WANT TO.
 """
 
+import os
 import sys
-import hmac
-import requests
+import functools
+import threading
 
-from time import time
+from time import time, sleep
+from collections import OrderedDict
+
+try:
+    from urllib.parse import urlencode
+except ImportError:  # python 2
+    from urllib import urlencode
+
+try:
+    from time import perf_counter
+except ImportError:  # python 2
+    from time import time as perf_counter
+
+try:
+    from os import replace
+except ImportError:  # python 2
+    def replace(source, target):
+        if os.name == 'nt' and os.path.exists(target):
+            os.remove(target)
+        os.rename(source, target)
+
+from .orderbook import OrderBook, FullOrderBook
+from .records import MarketSummary, Ticker, Volume
+from .snapshots import TickerDelta
+from .stream import json_loads, JSONStreamParser
 
 
 class CCexAPIError(Exception):
@@ -68,6 +93,440 @@ class CCexAPIResponseError(CCexAPIError):
         )
 
 
+class CCexAPIMaintenanceError(CCexAPIResponseError):
+    """
+    CCex API is under maintenance.
+    """
+
+
+class CCexAPICircuitOpenError(CCexAPIError):
+    """
+    CCex API calls are suspended after repeated failures.
+    """
+    def __init__(self, retry_in):
+        self.retry_in = retry_in
+        super(CCexAPICircuitOpenError, self).__init__(
+            'CCex API calls suspended after repeated failures, retry in {:.1f}s'.format(retry_in)
+        )
+
+
+TRANSIENT_ERRORS = (CCexAPIRequestError, CCexAPIResponseFormatError, CCexAPIMaintenanceError)
+""" Errors worth retrying: network failures, unparsable (error) pages and maintenance"""
+
+
+class CCexAPIBatchResult(dict):
+    """
+    Results of a batch of calls, by item (currency, market, ...).
+    Items whose call failed are not in the results but in `errors`.
+    """
+
+    def __init__(self, results=(), errors=None):
+        super(CCexAPIBatchResult, self).__init__(results)
+        self.errors = errors or {}
+        """ dict(str, CCexAPIError): error of each failed item"""
+
+    def __repr__(self):
+        return '<CCexAPIBatchResult results={} errors={}>'.format(len(self), len(self.errors))
+
+    @property
+    def ok(self):
+        """
+        bool: whether no call failed
+        """
+        return not self.errors
+
+
+class CCexAPIEndpoint(object):
+    """
+    Endpoint specification, built once when the endpoint method is defined.
+
+    The call name, the path and the mapping from the method arguments to the request
+    parameters are all derived from the decorated method signature, and compiled into
+    a method that calls `_call` directly, so calling an endpoint needs no introspection.
+    Arguments named in the `path` template are used to format it, the other ones are
+    sent as request parameters, with their `_` removed (ex: `currency_name` -> `currencyname`).
+    """
+
+    def __init__(self, func, path, call=None, authenticated=False, key=None, typed=None, stream=False):
+        """
+        Args:
+            func (function): Endpoint method, only its name and signature are used
+            path (str): Path of the endpoint, may be a template of the method arguments
+            call (str, optional): Call name, default to the method name without `_`
+            authenticated (bool): Whether the call has to be signed
+            key (str, optional): Only return this key of the result
+            typed (callable, optional): Convert the result when the client is in typed mode
+            stream (bool): Incrementally decode the result, the method then returns a generator of records
+        """
+        code = func.__code__
+        self.func = func
+        self.path = path
+        self.call = call or func.__name__.replace('_', '')
+        self.authenticated = authenticated
+        self.key = key
+        self.typed = typed
+        self.stream = stream
+        self.args = code.co_varnames[1:code.co_argcount]
+        self.defaults = func.__defaults__ or ()
+        self.path_args = tuple(arg for arg in self.args if '{' + arg + '}' in path)
+        self.params = tuple((arg.replace('_', ''), arg) for arg in self.args if arg not in self.path_args)
+
+    def compile(self):
+        """
+        Build the endpoint method.
+
+        Returns:
+            function: method with the same signature as the decorated one
+        """
+        namespace = {'spec': self}
+        signature = ['self']
+        first_default = len(self.args) - len(self.defaults)
+        for index, arg in enumerate(self.args):
+            if index >= first_default:
+                namespace['default_{}'.format(index)] = self.defaults[index - first_default]
+                signature.append('{0}=default_{1}'.format(arg, index))
+            else:
+                signature.append(arg)
+
+        path = repr(self.path)
+        if self.path_args:
+            path += '.format({})'.format(', '.join('{0}={0}'.format(arg) for arg in self.path_args))
+
+        source = (
+            'def {name}({signature}):\n'
+            '    return self.{method}(call={call!r}, path={path}, params={{{params}}},\n'
+            '                         authenticated={authenticated!r}, key={key!r}, typed={typed})\n'
+        ).format(
+            name=self.func.__name__,
+            method='_stream' if self.stream else '_call',
+            signature=', '.join(signature),
+            call=self.call,
+            path=path,
+            params=', '.join('{0!r}: {1}'.format(param, arg) for param, arg in self.params),
+            authenticated=self.authenticated,
+            key=self.key,
+            typed='spec.typed' if self.typed else None)
+        exec(source, namespace)
+
+        method = functools.wraps(self.func)(namespace[self.func.__name__])
+        method.endpoint = self
+        return method
+
+
+def endpoint(path, call=None, authenticated=False, key=None, typed=None, stream=False):
+    """
+    Declare an endpoint method, see `CCexAPIEndpoint`.
+    The decorated method body is never run, it only holds the signature and documentation.
+
+    Examples::
+
+            @endpoint('api_pub.html')
+            def get_orderbook(self, market, type_, depth=50):
+                pass
+
+    """
+    def decorator(func):
+        return CCexAPIEndpoint(func, path, call, authenticated, key, typed, stream).compile()
+    return decorator
+
+
+class CCexAPINonce(object):
+    """
+    Strictly increasing and thread-safe nonce source, the default one of `CCexAPI`.
+
+    Nonces are derived from the current time at the given resolution, and bumped when
+    several are requested within the same tick.
+    When a `path` is given, an upper bound of the issued nonces is persisted there,
+    a bit ahead of time so the file is not written on every call, and a restarted
+    process never goes backwards.
+
+    Examples::
+
+            nonce = CCexAPINonce(resolution=1000000, path='/var/lib/bot/nonce')
+            ccex = CCexAPI('api_key', 'api_secret', nonce=nonce)
+
+    """
+
+    def __init__(self, resolution=1000, path=None, reserve=60):
+        """
+        Args:
+            resolution (int): Nonces per second, default to milliseconds
+            path (str, optional): File where to persist the nonces upper bound
+            reserve (float): Seconds worth of nonces reserved each time the file is written
+        """
+        self.resolution = resolution
+        self.path = path
+        self.reserve = int(reserve * resolution)
+        self.lock = threading.Lock()
+        self.last = 0
+        self.persisted = 0
+
+        if path and os.path.exists(path):
+            with open(path) as f:
+                self.last = self.persisted = int(f.read().strip() or 0)
+
+    def __call__(self):
+        """
+        Returns:
+            int: a nonce greater than all previous ones
+        """
+        with self.lock:
+            nonce = max(int(time() * self.resolution), self.last + 1)
+            self.last = nonce
+            if self.path and nonce > self.persisted:
+                self._persist(nonce + self.reserve)
+            return nonce
+
+    def _persist(self, value):
+        tmp_path = '{}.tmp'.format(self.path)
+        with open(tmp_path, 'w') as f:
+            f.write(str(value))
+            # on disk before it replaces the previous bound, so a crash cannot lose both
+            f.flush()
+            os.fsync(f.fileno())
+        replace(tmp_path, self.path)
+        self.persisted = value
+
+
+class CCexAPISigner(object):
+    """
+    HMAC-SHA512 signer of authenticated calls URLs.
+
+    The secret is encoded and the HMAC keyed once, each signature starts from a copy
+    of that keyed state.
+    """
+    __slots__ = ('hmac',)
+
+    def __init__(self, api_secret):
+        """
+        Args:
+            api_secret (str): Your API private secret
+        """
+        import hmac
+        import hashlib
+
+        self.hmac = hmac.new(api_secret.encode('utf-8'), digestmod=hashlib.sha512)
+
+    def __call__(self, url):
+        """
+        Returns:
+            str: hexadecimal signature of `url`
+        """
+        signature = self.hmac.copy()
+        signature.update(url.encode('utf-8'))
+        return signature.hexdigest()
+
+
+class CCexAPIRequest(object):
+    """
+    Request of an API call, as built by `CCexAPI._prepare_request` and sent by transports.
+    """
+    __slots__ = ('method', 'url', 'headers')
+
+    def __init__(self, method, url, headers=None):
+        """
+        Args:
+            method (str): HTTP method
+            url (str): Full URL, query string included
+            headers (dict, optional): HTTP headers
+        """
+        self.method = method
+        self.url = url
+        self.headers = headers if headers is not None else {}
+
+    def __repr__(self):
+        return '<CCexAPIRequest [{}] {}>'.format(self.method, self.url)
+
+
+class CCexAPITransport(object):
+    """
+    Pooled HTTP transport, one is shared by every endpoint group of a `CCexAPI`.
+
+    `requests` is imported, and the session created, when the first request is sent.
+
+    Examples::
+
+            transport = CCexAPITransport(pool_maxsize=32, pool_block=True)
+            ccex = CCexAPI('api_key', 'api_secret', transport=transport)
+
+    """
+
+    def __init__(self, pool_connections=1, pool_maxsize=10, pool_block=False, keep_alive=True, timeout=None):
+        """
+        Args:
+            pool_connections (int): Number of per host connection pools to keep
+            pool_maxsize (int): Maximum number of connections kept open to the same host
+            pool_block (bool): Wait for a free connection instead of opening one above `pool_maxsize`,
+                making `pool_maxsize` a hard per host limit
+            keep_alive (bool): Keep connections open between calls
+            timeout (float, optional): Seconds to wait for the server before giving up
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self._session = None
+
+    @property
+    def session(self):
+        """
+        `requests.Session` of the transport, created on first use.
+        """
+        if self._session is None:
+            with self.lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self):
+        import requests.adapters
+
+        session = requests.Session()
+        session.headers.update({'User-Agent': 'CCEX_API_WRAPPER'})
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            pool_block=self.pool_block)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+
+    def send(self, request, stream=False):
+        """
+        Send a request.
+
+        Args:
+            request (CCexAPIRequest): request built by `CCexAPI._prepare_request`
+            stream (bool): Do not download the response body upfront
+
+        Returns:
+            requests.Response: server response
+        """
+        session = self.session
+        import requests.structures
+
+        prep_req = requests.PreparedRequest()
+        prep_req.method = request.method
+        prep_req.url = request.url
+        prep_req.headers = requests.structures.CaseInsensitiveDict(request.headers)
+        return session.send(prep_req, timeout=self.timeout, stream=stream)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+
+class CCexAPIStreamDecoder(object):
+    """
+    Push decoder of a streamed API response, shared by every client flavour:
+    text chunks are fed as they are received, and the records they complete returned.
+
+    The maintenance page is detected from the first chunk, and an error response
+    as soon as its `success` member is decoded.
+    """
+
+    def __init__(self, res):
+        """
+        Args:
+            res (object): Response, attached to the raised errors
+        """
+        self.res = res
+        self.envelope = {}
+        self.parser = JSONStreamParser(envelope=self.envelope)
+        self.started = False
+        self.checked = False
+
+    @property
+    def done(self):
+        """
+        bool: whether the end of the document was reached
+        """
+        return self.parser.done
+
+    def feed(self, chunk):
+        """
+        Args:
+            chunk (str): Next text chunk
+
+        Returns:
+            list(tuple(str, object)): key and record of the records completed by the chunk
+        """
+        if not self.started:
+            if not chunk.strip():
+                return []
+            self._check_start(chunk)
+        return self._parse(self.parser.feed, chunk)
+
+    def close(self):
+        """
+        Mark the end of the response.
+
+        Returns:
+            list(tuple(str, object)): key and record of the last records
+        """
+        if not self.started:
+            self._check_start('')
+        records = self._parse(self.parser.close)
+        if self.envelope.get('success') is not True:
+            raise CCexAPIResponseError(self.res, self.envelope)
+        return records
+
+    def _check_start(self, first):
+        self.started = True
+        if not first.lstrip().startswith('{'):
+            if 'Maintenance' in first:
+                raise CCexAPIMaintenanceError(self.res, {'message': first})
+            raise CCexAPIResponseFormatError(self.res, ValueError('Not a JSON object: {!r}'.format(first[:100])))
+
+    def _parse(self, parse, *args):
+        try:
+            records = parse(*args)
+        except ValueError as exc:
+            raise CCexAPIResponseFormatError(self.res, exc)
+
+        if not self.checked and 'success' in self.envelope:
+            if self.envelope['success'] is not True:
+                raise CCexAPIResponseError(self.res, self.envelope)
+            self.checked = True
+        return records
+
+
+class CCexAPIGroup(object):
+    """
+    Endpoints group attribute of a client, built on first access.
+    """
+
+    def __init__(self, name, cls_name, module=__name__, authenticated=False):
+        """
+        Args:
+            name (str): Attribute name
+            cls_name (str): Name of the group class
+            module (str): Module of the group class
+            authenticated (bool): Whether the group requires credentials
+        """
+        self.name = name
+        self.cls_name = cls_name
+        self.module = module
+        self.authenticated = authenticated
+
+    def __get__(self, client, owner):
+        if client is None:
+            return self
+        if isinstance(client, (CCexAPITickers, CCexAPIPublic, CCexAPIPrivate)):
+            raise AttributeError('{!r} is an endpoints group, it has no {!r} group'.format(client, self.name))
+        if self.authenticated and not (client.api_key and client.api_secret):
+            raise AttributeError('{} endpoints require an API key and secret'.format(self.name.capitalize()))
+
+        # cached in the instance dict, so next lookups do not reach the descriptor
+        group = client._group(getattr(sys.modules[self.module], self.cls_name))
+        return client.__dict__.setdefault(self.name, group)
+
+
 class CCexAPI(object):
     """
     CCex API main class.
@@ -84,97 +543,326 @@ class CCexAPI(object):
 
     """
     API_URL = 'https://c-cex.com/t'
+    STREAM_CHUNK_SIZE = 64 * 1024
 
-    def __init__(self, api_key=None, api_secret=None):
+    tickers = CCexAPIGroup('tickers', 'CCexAPITickers')
+    """ Tickers endpoints"""
+    public = CCexAPIGroup('public', 'CCexAPIPublic')
+    """ Public endpoints"""
+    private = CCexAPIGroup('private', 'CCexAPIPrivate', authenticated=True)
+    """ Private endpoints"""
+
+    def __init__(self, api_key=None, api_secret=None, api_url=None, transport=None, nonce=None, cache=None,
+                 typed=False, fast_json=False, limiter=None, retry=None, breaker=None, hooks=None):
         """
-        `CCexAPI` offers three attribute representing group of endpoints.
-        The `private` attribute will only be created when credentials are present.
+        `CCexAPI` offers three attribute representing group of endpoints, built on first access.
+        The `private` attribute is only available when credentials are present.
+        All groups share the client state, and thus the same connection pool, nonce source and cache.
 
         See Also:
         Args:
             api_key (str, optional): Your API key
             api_secret (str, optional): Your API private secret
+            api_url (str, optional): Override the API base url (ex: a local stub server)
+            transport (CCexAPITransport, optional): Transport to send requests with
+            nonce (callable, optional): Nonce source of authenticated calls, default to a `CCexAPINonce`
+            cache (CCexAPICache, optional): Cache of tickers and public calls results
+            typed (bool): Return compact typed results instead of raw JSON for endpoints supporting it
+            fast_json (bool): Decode responses with `orjson` or `ujson` when installed
+            limiter (CCexAPIRateLimiter, optional): Rate limiter of the calls sent
+            retry (CCexAPIRetry, optional): Retry policy of tickers and public calls
+            breaker (CCexAPICircuitBreaker, optional): Circuit breaker failing fast while the API is down
+            hooks (list(callable), optional): Called after each request with its call name, timing spans,
+                response size and error, see `CCexAPIMetrics`
         """
         self.api_key = api_key
         self.api_secret = api_secret
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': 'CCEX_API_WRAPPER'})
-
-        if self.__class__ == CCexAPI():
-            self.tickers = CCexAPITickers(api_key, api_secret)
-            """ Tickers endpoints"""
-            self.public = CCexAPIPublic(api_key, api_secret)
-            """ Public endpoints"""
-            if api_key and api_secret:
-                self.private = CCexAPIPrivate(api_key, api_secret)
-                """ Private endpoints"""
-
-    def _call(self, call, path, params=None, headers=None, authenticated=False):
-        try:
-            url = '{url}/{path}'.format(url=self.API_URL, path=path)
-            if not params:
-                params = {}
+        if api_url:
+            self.API_URL = api_url
+        self.transport = transport or CCexAPITransport()
+        self.nonce = nonce or CCexAPINonce()
+        self.cache = cache
+        self.typed = typed
+        self.fast_json = fast_json
+        self.json_loads = json_loads(fast_json)
+        self.limiter = limiter
+        self.retry = retry
+        self.breaker = breaker
+        self.hooks = tuple(hooks or ())
+
+    def _group(self, cls):
+        """
+        Build an endpoints group sharing this client state, without running its constructor.
+        The state is copied, so that endpoints read it at plain attribute speed, and kept in sync
+        by `__setattr__`: options changed later on the client (ex: `ccex.typed = True`) apply to its groups.
+        """
+        group = cls.__new__(cls)
+        group.__dict__.update(
+            (name, value) for name, value in self.__dict__.items() if not isinstance(value, CCexAPI))
+        return group
+
+    def __setattr__(self, name, value):
+        super(CCexAPI, self).__setattr__(name, value)
+        # groups already built, see `CCexAPIGroup`
+        for group in list(self.__dict__.values()):
+            if isinstance(group, CCexAPI):
+                group.__dict__[name] = value
+        if name == 'api_secret':
+            # the keyed signer follows the secret
+            self.signer = CCexAPISigner(value) if value else None
+
+    @property
+    def session(self):
+        """
+        `requests.Session` of the shared transport.
+        """
+        return self.transport.session
 
-            params['a'] = call
+    def close(self):
+        """
+        Close the underlying transport.
+        """
+        self.transport.close()
 
-            authenticate = False
-            if authenticated:
-                if self.api_key and self.api_secret:
-                    authenticate = True
+    @staticmethod
+    def _kind(path, authenticated):
+        """
+        Returns:
+            str: endpoint class of a call, "ticker", "public" or "private"
+        """
+        if authenticated:
+            return 'private'
+        return 'ticker' if path.endswith('json') else 'public'
 
-                    params['apikey'] = self.api_key
-                    params['nonce'] = int(time())
-                else:
-                    raise CCexAPIError('This call requires an API key and secret')
-
-            req = requests.Request(
-                method='GET',
-                url=url,
-                params=params,
-                headers=headers)
-            prep_req = req.prepare()
-
-            if authenticate:
-                signature = hmac.new(
-                    self.api_secret.encode('utf-8'),
-                    prep_req.url.encode('utf-8'),
-                    'sha512'
-                ).hexdigest()
-                prep_req.headers['apisign'] = signature
+    def _prepare_request(self, call, path, params=None, headers=None, authenticated=False):
+        """
+        Build the request of an API call, and sign it when needed.
+        Shared by every client flavour so they all query the API the same way.
 
-            try:
-                res = self.session.send(prep_req)
-            except Exception as exc:
-                raise CCexAPIRequestError(prep_req, exc)
+        The query string is encoded directly from the endpoint parameters, as
+        `requests.Request.prepare` would, without its URL parsing and requoting.
+        """
+        if not params:
+            params = {}
 
-            if 'Maintenance' in res.text:
-                raise CCexAPIResponseError(res, {'message': res.text})
+        params['a'] = call
 
-            try:
-                data = res.json()
-            except Exception as exc:
-                raise CCexAPIResponseFormatError(res, exc)
+        if authenticated:
+            if not (self.api_key and self.api_secret):
+                raise CCexAPIError('This call requires an API key and secret')
+            params['apikey'] = self.api_key
+            params['nonce'] = self.nonce()
+
+        url = '{url}/{path}?{query}'.format(
+            url=self.API_URL,
+            path=path,
+            query=urlencode([(name, value) for name, value in params.items() if value is not None], True))
+
+        headers = dict(headers or ())
+        if authenticated:
+            headers['apisign'] = self.signer(url)
+
+        return CCexAPIRequest('GET', url, headers)
 
-            # for tickers
-            if url.endswith('json'):
-                return data
+    def _parse_response(self, res, body, path, key=None):
+        """
+        Deserialize and unwrap an API response body.
+        Shared by every client flavour so they all raise the same errors.
+        The body is only decoded to text when it is not JSON, to look for the maintenance page.
+        """
+        try:
+            data = self.json_loads(body)
+        except Exception as exc:
+            text = body.decode('utf-8', 'replace') if isinstance(body, bytes) else body
+            if 'Maintenance' in text:
+                raise CCexAPIMaintenanceError(res, {'message': text})
+            raise CCexAPIResponseFormatError(res, exc)
+
+        # for tickers
+        if path.endswith('json'):
+            result = data
 
-            # for api methods
+        # for api methods
+        else:
             if data.get('success') is not True:
                 raise CCexAPIResponseError(res, data)
 
-            return data.get('result')
+            result = data.get('result')
+
+        if key is not None:
+            return result.get(key)
+        return result
+
+    def _call(self, call, path, params=None, headers=None, authenticated=False, key=None, typed=None):
+        try:
+            if self.cache is not None and not authenticated:
+                result = self.cache.get(
+                    call, path, params, key,
+                    lambda: self._load(call, path, params, headers, authenticated, key))
+            else:
+                result = self._load(call, path, params, headers, authenticated, key)[0]
+
+            if typed is not None and self.typed:
+                return typed(result)
+            return result
 
         except CCexAPIError:
             raise
         except Exception as exc:
             raise CCexAPIError('Unexpected error during CCex API call: {}'.format(repr(exc)))
 
+    def _load(self, call, path, params, headers, authenticated, key):
+        """
+        Send an API call, applying the retry policy and circuit breaker.
 
+        Returns:
+            tuple(object, int): call result and response size
+        """
+        delays = iter(()) if self.retry is None or authenticated else self.retry.delays()
+        while True:
+            probe = self.breaker.before() if self.breaker is not None else False
+
+            try:
+                loaded = self._send(call, path, params, headers, authenticated, key)
+            except TRANSIENT_ERRORS as exc:
+                if self.breaker is not None and self.breaker.failure(exc):
+                    raise
+                delay = next(delays, None)
+                if delay is None:
+                    raise
+                sleep(delay)
+                continue
+            except Exception:
+                # the API answered, or the error is not the API fault
+                if self.breaker is not None:
+                    self.breaker.success()
+                raise
+            except BaseException:
+                if self.breaker is not None:
+                    self.breaker.cancel(probe)
+                raise
+
+            if self.breaker is not None:
+                self.breaker.success()
+            return loaded
+
+    def _send(self, call, path, params, headers, authenticated, key):
+        """
+        Send an API call once.
+
+        Returns:
+            tuple(object, int): call result and response size
+        """
+        started = perf_counter()
+        if self.limiter is not None:
+            self.limiter.acquire(self._kind(path, authenticated))
+        acquired = perf_counter()
+        prep_req = self._prepare_request(call, path, dict(params or {}), headers, authenticated)
+        prepared = perf_counter()
+        spans = {'limiter': acquired - started, 'prepare': prepared - acquired}
+        size = error = None
+
+        try:
+            try:
+                res = self.transport.send(prep_req)
+            except Exception as exc:
+                raise CCexAPIRequestError(prep_req, exc)
+
+            body = res.content
+            size = len(body)
+            received = perf_counter()
+            spans['transport'] = received - prepared
+            elapsed = getattr(res, 'elapsed', None)
+            if elapsed is not None:
+                spans['headers'] = min(elapsed.total_seconds(), spans['transport'])
+                spans['download'] = spans['transport'] - spans['headers']
+
+            result = self._parse_response(res, body, path, key)
+            spans['parse'] = perf_counter() - received
+            return result, size
+        except Exception as exc:
+            error = exc
+            raise
+        finally:
+            if self.hooks:
+                self._record(call, spans, started, size, error)
+
+    def _record(self, call, spans, started, size, error):
+        """
+        Pass the timings of a request to the hooks.
+        """
+        spans['total'] = perf_counter() - started
+        for hook in self.hooks:
+            hook(call, spans, size, error)
+
+    def _stream(self, call, path, params=None, headers=None, authenticated=False, key=None, typed=None):
+        """
+        Send an API call and incrementally decode its result, see `CCexAPIStreamDecoder`.
+        Neither cached nor typed. The circuit breaker is told the outcome once the result is fully decoded.
+
+        Yields:
+            tuple(str, object): key and record
+        """
+        probe = self.breaker.before() if self.breaker is not None else False
+        try:
+            if self.limiter is not None:
+                self.limiter.acquire(self._kind(path, authenticated))
+            prep_req = self._prepare_request(call, path, dict(params or {}), headers, authenticated)
+
+            try:
+                res = self.transport.send(prep_req, stream=True)
+            except Exception as exc:
+                raise CCexAPIRequestError(prep_req, exc)
+
+            try:
+                res.encoding = res.encoding or 'utf-8'
+                chunks = res.iter_content(chunk_size=self.STREAM_CHUNK_SIZE, decode_unicode=True)
+                for record in self._iter_records(res, chunks):
+                    yield record
+            except CCexAPIError:
+                raise
+            except Exception as exc:
+                # connection lost while downloading the result
+                raise CCexAPIRequestError(prep_req, exc)
+            finally:
+                res.close()
+        except TRANSIENT_ERRORS as exc:
+            if self.breaker is not None:
+                self.breaker.failure(exc)
+            raise
+        except Exception:
+            if self.breaker is not None:
+                self.breaker.success()
+            raise
+        except BaseException:
+            # includes the consumer closing the generator before the end of the result
+            if self.breaker is not None:
+                self.breaker.cancel(probe)
+            raise
+        if self.breaker is not None:
+            self.breaker.success()
+
+    @staticmethod
+    def _iter_records(res, chunks):
+        """
+        Decode a streamed response, see `CCexAPIStreamDecoder`.
+        """
+        decoder = CCexAPIStreamDecoder(res)
+        for chunk in chunks:
+            for record in decoder.feed(chunk):
+                yield record
+            if decoder.done:
+                break
+        for record in decoder.close():
+            yield record
+
+
+# noinspection PyUnusedLocal
 class CCexAPITickers(CCexAPI):
     """
     Tickers endpoints
     """
+    @endpoint('coinnames.json', call='ticker')
     def tickers_coin_names(self):
         """
         Full names for all coin tickers.
@@ -196,11 +884,8 @@ class CCexAPITickers(CCexAPI):
             }
 
         """
-        return self._call(
-            call='ticker',
-            path='coinnames.json'
-        )
 
+    @endpoint('pairs.json', call='ticker', key='pairs')
     def tickers_pairs(self):
         """
         List of available trading pairs.
@@ -216,11 +901,8 @@ class CCexAPITickers(CCexAPI):
             ["usd-btc", "1337-btc", ... "zny-doge"]
 
         """
-        return self._call(
-            call='ticker',
-            path='coinnames.json'
-        )['pairs']
 
+    @endpoint('{coin1}-{coin2}.json', call='ticker', key='ticker', typed=Ticker.from_dict)
     def tickers_pair_market_data(self, coin1, coin2):
         """
         Online market data for given trading pair.
@@ -233,7 +915,7 @@ class CCexAPITickers(CCexAPI):
             coin2: second coin name in the pair
 
         Returns:
-            dict: various data about the market
+            dict: various data about the market, a `Ticker` in typed mode
 
         Example::
 
@@ -251,11 +933,8 @@ class CCexAPITickers(CCexAPI):
             }
 
         """
-        return self._call(
-            call='ticker',
-            path='{coin1}-{coin2}.json'.format(coin1=coin1, coin2=coin2)
-        ).get('ticker')
 
+    @endpoint('prices.json', call='ticker', typed=Ticker.from_result)
     def tickers_all_pairs_market_data(self):
         """
         All online trading pairs market data.
@@ -264,7 +943,7 @@ class CCexAPITickers(CCexAPI):
             https://c-cex.com/t/prices.json
 
         Returns:
-            dict: various data about the market
+            dict: various data about the market, `Ticker` by pair name in typed mode
 
         Example::
 
@@ -294,11 +973,37 @@ class CCexAPITickers(CCexAPI):
             }
 
         """
-        return self._call(
-            call='ticker',
-            path='prices.json'
-        )
 
+    ticker_delta = None
+    """ `TickerDelta` of `tickers_all_pairs_changes`, created on first call"""
+
+    def tickers_all_pairs_changes(self):
+        """
+        Changes of all trading pairs market data since the previous call, see `TickerDelta`.
+        The first call returns all pairs.
+
+        Returns:
+            dict(str, dict): changed fields values by pair, `None` for removed pairs
+
+        Example::
+
+            {
+                "usd-btc": {
+                    "lastprice": 0.00240391,
+                    "buy": 0.0024
+                },
+                "acp-btc": None
+            }
+
+        """
+        return self._ticker_changes(self.tickers_all_pairs_market_data())
+
+    def _ticker_changes(self, result):
+        if self.ticker_delta is None:
+            self.ticker_delta = TickerDelta()
+        return self.ticker_delta.update(result)
+
+    @endpoint('volume_{coin}.json', call='ticker', key='ticker', typed=Volume.from_result)
     def tickers_volume_coin(self, coin):
         """
         Online volume report for last 24 hours at a given coin market
@@ -310,7 +1015,7 @@ class CCexAPITickers(CCexAPI):
             coin: coin name
 
         Returns:
-            dict: various data about the market
+            dict: various data about the market, `Volume` by coin name in typed mode
 
         Example::
 
@@ -326,10 +1031,6 @@ class CCexAPITickers(CCexAPI):
             }
 
         """
-        return self._call(
-            call='ticker',
-            path='volume_{coin}.json'.format(coin=coin)
-        ).get('ticker')
 
 
 # noinspection PyUnusedLocal
@@ -337,22 +1038,7 @@ class CCexAPIPublic(CCexAPI):
     """
     Public endpoints
     """
-    def _public_call(self):
-        """
-        Hackish way of not rewriting real call name and params ...
-        They are extracted from the caller's function.
-        """
-        # noinspection PyProtectedMember
-        caller = sys._getframe().f_back
-        call = caller.f_code.co_name.replace('_', '')
-        params = dict((k.replace('_', ''), v) for k, v in caller.f_locals.items() if k != 'self')
-
-        return self._call(
-            call=call,
-            path='api_pub.html',
-            params=params
-        )
-
+    @endpoint('api_pub.html')
     def get_markets(self):
         """
         Get the open and available trading markets along with other meta data.
@@ -386,8 +1072,8 @@ class CCexAPIPublic(CCexAPI):
             }, ... ]
 
         """
-        return self._public_call()
 
+    @endpoint('api_pub.html', typed=OrderBook.from_result)
     def get_orderbook(self, market, type_, depth=50):
         """
         Retrieve the orderbook for a given market.
@@ -401,7 +1087,7 @@ class CCexAPIPublic(CCexAPI):
             depth (int): Depth of an order book to retrieve. Default is 50, max is 100
 
         Returns:
-            dict: various data about the market
+            dict: various data about the market, an `OrderBook` in typed mode
 
         Example::
 
@@ -416,8 +1102,8 @@ class CCexAPIPublic(CCexAPI):
             }
 
         """
-        return self._public_call()
 
+    @endpoint('api_pub.html', typed=FullOrderBook.from_result)
     def get_full_orderbook(self, depth=50):
         """
         Retrieve the orderbook for all markets.
@@ -429,7 +1115,7 @@ class CCexAPIPublic(CCexAPI):
             depth (int): Depth of an order book to retrieve. Default is 50, max is 100
 
         Returns:
-            dict: various data about the market
+            dict: various data about the market, a `FullOrderBook` in typed mode
 
         Example::
 
@@ -446,8 +1132,25 @@ class CCexAPIPublic(CCexAPI):
             }
 
         """
-        return self._public_call()
 
+    @endpoint('api_pub.html', call='getfullorderbook', stream=True)
+    def iter_full_orderbook(self, depth=50):
+        """
+        Same as `get_full_orderbook`, but orders are decoded one by one while the response is downloaded.
+
+        Args:
+            depth (int): Depth of an order book to retrieve. Default is 50, max is 100
+
+        Yields:
+            tuple(str, dict): side ("buy" or "sell") and order
+
+        Example::
+
+            books = FullOrderBook.from_records(ccex.public.iter_full_orderbook(100))
+
+        """
+
+    @endpoint('api_pub.html', typed=MarketSummary.from_result)
     def get_market_summaries(self):
         """
         Get the last 24 hour summary of all active markets.
@@ -457,7 +1160,7 @@ class CCexAPIPublic(CCexAPI):
 
 
         Returns:
-            list(dict): various data about the market
+            list(dict): various data about the market, a list of `MarketSummary` in typed mode
 
         Example::
 
@@ -494,8 +1197,8 @@ class CCexAPIPublic(CCexAPI):
             }, ... ]
 
         """
-        return self._public_call()
 
+    @endpoint('api_pub.html')
     def get_market_history(self, market, count=50):
         """
         Latest trades that have occured for a specific market.
@@ -531,8 +1234,8 @@ class CCexAPIPublic(CCexAPI):
             }]
 
         """
-        return self._public_call()
 
+    @endpoint('api_pub.html')
     def get_full_market_history(self, count=50):
         """
         Latest trades that have occured for all markets.
@@ -569,8 +1272,21 @@ class CCexAPIPublic(CCexAPI):
             }]
 
         """
-        return self._public_call()
 
+    @endpoint('api_pub.html', call='getfullmarkethistory', stream=True)
+    def iter_full_market_history(self, count=50):
+        """
+        Same as `get_full_market_history`, but trades are decoded one by one while the response is downloaded.
+
+        Args:
+            count (:obj:`int`, optional): Number of entries to return. Range 1-100, default is 50
+
+        Yields:
+            tuple(None, dict): `None` and trade
+
+        """
+
+    @endpoint('api_pub.html')
     def get_balance_distribution(self, currency_name):
         """
         Exchange's wallet balance distribution for specific currency.
@@ -595,7 +1311,6 @@ class CCexAPIPublic(CCexAPI):
             }
 
         """
-        return self._public_call()
 
 
 # noinspection PyUnusedLocal
@@ -603,26 +1318,83 @@ class CCexAPIPrivate(CCexAPI):
     """
     Private endpoints
     """
-    def __init__(self, api_key, api_secret):
-        super(CCexAPIPrivate, self).__init__(api_key, api_secret)
+    def __init__(self, api_key, api_secret, **kwargs):
+        super(CCexAPIPrivate, self).__init__(api_key, api_secret, **kwargs)
 
-    def _private_call(self):
+    BATCH_WORKERS = 1
+    """ Default number of concurrent calls of batches, one so that nonces reach the API in order"""
+
+    def get_balance_batch(self, currencies, workers=None):
         """
-        Hackish way of not rewriting real call name and params ...
-        They are extracted from the caller's function.
+        Retrieve the balances of several currencies, calls are sent in order unless `workers` is above 1.
+
+        Args:
+            currencies (iterable(str)): Currency names (ex: BTC)
+            workers (int, optional): Maximum number of concurrent calls, default to `BATCH_WORKERS`.
+                Above 1, nonces may reach the API out of order: only for API keys accepting them
+
+        Returns:
+            CCexAPIBatchResult: `get_balance` result by currency, and errors of failed ones
+
+        Example::
+
+            balances = ccex.private.get_balance_batch(['BTC', 'LTC', 'DOGE'])
+            balances['BTC']['Available']
+            balances.errors  # {'DOGE': CCexAPIResponseError(...)}
+
         """
-        # noinspection PyProtectedMember
-        caller = sys._getframe().f_back
-        call = caller.f_code.co_name.replace('_', '')
-        params = dict((k.replace('_', ''), v) for k, v in caller.f_locals.items() if k != 'self')
+        return self._batch(self.get_balance, currencies, workers)
 
-        return self._call(
-            call=call,
-            path='api.html',
-            params=params,
-            authenticated=True
-        )
+    def get_open_orders_batch(self, markets, workers=None):
+        """
+        Get opened orders of several markets, calls are sent in order unless `workers` is above 1.
+
+        Args:
+            markets (iterable(str)): Market names (ex: USD-BTC)
+            workers (int, optional): Maximum number of concurrent calls, default to `BATCH_WORKERS`.
+                Above 1, nonces may reach the API out of order: only for API keys accepting them
+
+        Returns:
+            CCexAPIBatchResult: `get_open_orders` result by market, and errors of failed ones
+        """
+        return self._batch(self.get_open_orders, markets, workers)
+
+    def _batch(self, method, items, workers=None):
+        """
+        Call an endpoint once per item, one call after the other, or from a pool of `workers` threads.
+
+        Calls still go through the rate limiter, and are signed only once it lets them go.
+        Concurrent calls are not serialized though: a call may reach the API after one signed later,
+        with a lower nonce, so concurrency is only safe for API keys accepting such nonces.
+        A failed call is recorded in the result `errors` and does not abort the others.
+        """
+        from multiprocessing.pool import ThreadPool
+
+        items = list(OrderedDict.fromkeys(items))
+        results = CCexAPIBatchResult()
+        if not items:
+            return results
+
+        def call(item):
+            try:
+                return item, method(item), None
+            except CCexAPIError as exc:
+                return item, None, exc
+
+        workers = min(workers or self.BATCH_WORKERS, len(items))
+        pool = ThreadPool(workers) if workers > 1 else None
+        try:
+            for item, result, error in (pool.imap(call, items) if pool is not None else map(call, items)):
+                if error is None:
+                    results[item] = result
+                else:
+                    results.errors[item] = error
+        finally:
+            if pool is not None:
+                pool.terminate()
+        return results
 
+    @endpoint('api.html', authenticated=True, key='uuid')
     def buy_limit(self, market, quantity, rate):
         """
         Place a buy limit order in a specific market. Make sure you have the proper permissions set on your API keys.
@@ -638,8 +1410,8 @@ class CCexAPIPrivate(CCexAPI):
         Returns:
             str: uuid
         """
-        return self._private_call().get('uuid')
 
+    @endpoint('api.html', authenticated=True, key='uuid')
     def sell_limit(self, market, quantity, rate):
         """
         Place a sell limit order in a specific market. Make sure you have the proper permissions set on your API keys.
@@ -655,8 +1427,8 @@ class CCexAPIPrivate(CCexAPI):
         Returns:
             str: uuid
         """
-        return self._private_call().get('uuid')
 
+    @endpoint('api.html', authenticated=True)
     def cancel(self, uuid):
         """
         Cancel a buy or sell order.
@@ -667,8 +1439,8 @@ class CCexAPIPrivate(CCexAPI):
         Args:
             uuid (str): uuid of buy or sell order
         """
-        return self._private_call()
 
+    @endpoint('api.html', authenticated=True)
     def get_balance(self, currency):
         """
         Retrieve the balance from your account for a specific currency.
@@ -695,8 +1467,8 @@ class CCexAPIPrivate(CCexAPI):
             }
 
         """
-        return self._private_call()
 
+    @endpoint('api.html', authenticated=True)
     def get_balances(self):
         """
         Retrieve all balances from your account.
@@ -724,8 +1496,8 @@ class CCexAPIPrivate(CCexAPI):
             }, ... ]
 
         """
-        return self._private_call()
 
+    @endpoint('api.html', authenticated=True)
     def get_order(self, uuid):
         """
         Retrieve a single order by uuid.
@@ -768,8 +1540,8 @@ class CCexAPIPrivate(CCexAPI):
             }]
 
         """
-        return self._private_call()
 
+    @endpoint('api.html', authenticated=True)
     def get_open_orders(self, market=None):
         """
         Get all orders that you currently have opened. A specific market can be requested.
@@ -824,8 +1596,8 @@ class CCexAPIPrivate(CCexAPI):
             }, ... ]
 
         """
-        return self._private_call()
 
+    @endpoint('api.html', authenticated=True)
     def get_order_history(self, market=None, count=None):
         """
         Retrieve your order history.
@@ -875,8 +1647,8 @@ class CCexAPIPrivate(CCexAPI):
             }]
 
         """
-        return self._private_call()
 
+    @endpoint('api.html', authenticated=True)
     def my_trades(self, market_id):
         """
         Retrieve detailed trading history.
@@ -916,8 +1688,10 @@ class CCexAPIPrivate(CCexAPI):
                 "order_id": "7324856"
             }]
         """
-        return self._private_call()
 
 
-__all__ = [CCexAPI, CCexAPITickers, CCexAPIPublic, CCexAPIPrivate,
-       CCexAPIError, CCexAPIRequestError, CCexAPIResponseError, CCexAPIResponseFormatError]
\ No newline at end of file
+__all__ = ['CCexAPI', 'CCexAPITickers', 'CCexAPIPublic', 'CCexAPIPrivate',
+           'CCexAPITransport', 'CCexAPIRequest', 'CCexAPIGroup', 'CCexAPINonce', 'CCexAPISigner', 'CCexAPIEndpoint',
+           'CCexAPIBatchResult', 'CCexAPIStreamDecoder', 'endpoint',
+           'CCexAPIError', 'CCexAPIRequestError', 'CCexAPIResponseError', 'CCexAPIResponseFormatError',
+           'CCexAPIMaintenanceError', 'CCexAPICircuitOpenError', 'TRANSIENT_ERRORS']
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+           DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+                    Version 2, December 2004
+
+ Copyright (C) 2004 Sam Hocevar <sam@hocevar.net>
+
+ Everyone is permitted to copy and distribute verbatim or modified
+ copies of this license document, and changing it is allowed as long
+ as the name is changed.
+
+            DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+   TERMS AND CONDITIONS FOR COPYING, DISTRIBUTION AND MODIFICATION
+
+  0. You just DO WHAT THE FUCK YOU WANT TO.
+"""
+
+import json
+import math
+import threading
+
+from time import time
+
+
+class CCexAPIHistogram(object):
+    """
+    HDR style histogram: values are counted in log-linear buckets, so that memory is bounded
+    whatever the range of values, with a relative error of at most `2 ** -precision`.
+
+    Examples::
+
+            histogram = CCexAPIHistogram(unit=1e-6)  # seconds, recorded at microsecond resolution
+            histogram.record(0.0123)
+            histogram.percentile(99)
+
+    """
+    __slots__ = ('unit', 'precision', 'sub_buckets', 'counts', 'count', 'total', 'min', 'max')
+
+    def __init__(self, unit=1e-6, precision=7):
+        """
+        Args:
+            unit (float): Smallest distinguished value, values are recorded as integer multiples of it
+            precision (int): Number of significant bits kept, 7 is an error below 1%
+        """
+        self.unit = unit
+        self.precision = precision
+        self.sub_buckets = 1 << precision
+        self.counts = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+    def _index(self, units):
+        if units < self.sub_buckets:
+            return units
+        shift = units.bit_length() - self.precision
+        half = self.sub_buckets >> 1
+        return self.sub_buckets + (shift - 1) * half + (units >> shift) - half
+
+    def _value(self, index):
+        """
+        Returns:
+            float: middle value of a bucket
+        """
+        if index < self.sub_buckets:
+            return index * self.unit
+        half = self.sub_buckets >> 1
+        shift, top = divmod(index - self.sub_buckets, half)
+        shift += 1
+        low = (top + half) << shift
+        return (low + ((1 << shift) - 1) / 2.0) * self.unit
+
+    def record(self, value, count=1):
+        """
+        Args:
+            value (float): Recorded value, negative ones are counted as 0
+            count (int): Number of times it occurred
+        """
+        index = self._index(max(int(value / self.unit), 0))
+        self.counts[index] = self.counts.get(index, 0) + count
+        self.count += count
+        self.total += value * count
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        """
+        Add the values of a histogram of the same unit and precision.
+        """
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    def percentile(self, percent):
+        """
+        Returns:
+            float: value below which `percent` % of the values are, `None` when empty
+        """
+        if not self.count:
+            return None
+        # nearest rank, multiplying first so that exact ranks are not rounded up (ex: 7 % of 100)
+        rank = max(1, int(math.ceil(percent * self.count / 100.0)))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                return min(max(self._value(index), self.min), self.max)
+        return self.max
+
+    def snapshot(self, percentiles=(50, 90, 99, 99.9)):
+        """
+        Returns:
+            dict: `count`, `min`, `max`, `mean` and the given percentiles (keys like `p99`)
+        """
+        snapshot = {'count': self.count, 'min': self.min, 'max': self.max, 'mean': self.mean}
+        for percent in percentiles:
+            snapshot['p{:g}'.format(percent)] = self.percentile(percent)
+        return snapshot
+
+
+class CCexAPIMetrics(object):
+    """
+    In-process collector of calls timings, a `CCexAPI` hook.
+
+    Hooks are called once per request sent, with the call name (ex: `getorderbook`),
+    the timing spans of the request in seconds, the response size in bytes and the error raised, if any.
+    Spans are:
+
+    - `limiter`: waiting for the rate limiter
+    - `prepare`: building and signing the request
+    - `headers`: until the response headers are received, connection, TLS and server time included
+      (`CCexAPI` only)
+    - `download`: reading the response body (`CCexAPI` only)
+    - `transport`: whole exchange with the server
+    - `parse`: decoding and unwrapping the response
+    - `total`: all of the above
+
+    Examples::
+
+            metrics = CCexAPIMetrics()
+            ccex = CCexAPI(hooks=[metrics])
+            ...
+            metrics.snapshot()['getmarketsummaries']['spans']['total']['p99']
+            metrics.export('/var/log/bot/ccex_metrics.json', reset=True)
+
+    """
+
+    def __init__(self, unit=1e-6, precision=7):
+        """
+        Args:
+            unit (float): Timings resolution in seconds
+            precision (int): Histograms precision, see `CCexAPIHistogram`
+        """
+        self.unit = unit
+        self.precision = precision
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.started = time()
+
+    def __call__(self, call, spans, size, error):
+        """
+        Record a request.
+
+        Args:
+            call (str): Call name
+            spans (dict(str, float)): Timing spans, in seconds
+            size (int): Response size in bytes, `None` when no response was received
+            error (Exception): Error raised by the request, `None` on success
+        """
+        with self.lock:
+            metrics = self.calls.get(call)
+            if metrics is None:
+                metrics = self.calls[call] = {
+                    'errors': 0,
+                    'spans': {},
+                    'bytes': CCexAPIHistogram(1, self.precision),
+                }
+            if error is not None:
+                metrics['errors'] += 1
+            if size is not None:
+                metrics['bytes'].record(size)
+            histograms = metrics['spans']
+            for span, value in spans.items():
+                histogram = histograms.get(span)
+                if histogram is None:
+                    histogram = histograms[span] = CCexAPIHistogram(self.unit, self.precision)
+                histogram.record(value)
+
+    def reset(self):
+        with self.lock:
+            self.calls = {}
+            self.started = time()
+
+    def snapshot(self, percentiles=(50, 90, 99, 99.9), reset=False):
+        """
+        Args:
+            percentiles (tuple(float)): Percentiles to report
+            reset (bool): Start over once the snapshot is taken
+
+        Returns:
+            dict(str, dict): by call name, number of `errors`, `bytes` histogram and `spans` histograms snapshots
+        """
+        with self.lock:
+            calls = self.calls
+            if reset:
+                self.calls = {}
+                self.started = time()
+
+            return dict((call, {
+                'errors': metrics['errors'],
+                'bytes': metrics['bytes'].snapshot(percentiles),
+                'spans': dict((span, histogram.snapshot(percentiles)) for span, histogram in metrics['spans'].items()),
+            }) for call, metrics in calls.items())
+
+    def export(self, path=None, percentiles=(50, 90, 99, 99.9), reset=False):
+        """
+        Export a snapshot as JSON.
+
+        Args:
+            path (str, optional): File to write to
+            percentiles (tuple(float)): Percentiles to report
+            reset (bool): Start over once the snapshot is taken
+
+        Returns:
+            str: JSON snapshot, with the time window it covers
+        """
+        started = self.started
+        exported = json.dumps({
+            'started': started,
+            'ended': time(),
+            'calls': self.snapshot(percentiles, reset),
+        }, sort_keys=True)
+        if path is not None:
+            with open(path, 'w') as f:
+                f.write(exported)
+        return exported
+
+
+__all__ = ['CCexAPIMetrics', 'CCexAPIHistogram']
@@ -0,0 +1,532 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+           DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+                    Version 2, December 2004
+
+ Copyright (C) 2004 Sam Hocevar <sam@hocevar.net>
+
+ Everyone is permitted to copy and distribute verbatim or modified
+ copies of this license document, and changing it is allowed as long
+ as the name is changed.
+
+            DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+   TERMS AND CONDITIONS FOR COPYING, DISTRIBUTION AND MODIFICATION
+
+  0. You just DO WHAT THE FUCK YOU WANT TO.
+"""
+
+import zlib
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+
+try:
+    from sys import intern
+except ImportError:  # python 2
+    pass
+
+_numpy = []
+
+
+def numpy():
+    """
+    Import NumPy on first use.
+
+    Returns:
+        module: `numpy`, or `None` when it is not installed
+    """
+    if not _numpy:
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        _numpy.append(np)
+    return _numpy[0]
+
+
+def float_array(values, size=None):
+    """
+    Build a contiguous float64 array, NumPy one when available.
+
+    Args:
+        values (iterable(float)): Array values
+        size (int, optional): Number of values, when known
+    """
+    np = numpy()
+    if np is not None:
+        return np.fromiter(values, dtype=np.float64, count=-1 if size is None else size)
+    return array('d', values)
+
+
+LevelUpdate = namedtuple('LevelUpdate', ('side', 'action', 'rate', 'quantity'))
+""" Change of one price level between two order books: side ("buy" or "sell"),
+action ("add", "change" or "remove"), rate and new quantity (0 when removed)"""
+
+
+def _tobytes(values):
+    tobytes = getattr(values, 'tobytes', None)
+    return tobytes() if tobytes is not None else values.tostring()
+
+
+class OrderBookSide(object):
+    """
+    One side of an order book, price levels are sorted best first.
+
+    Rates and quantities are stored in contiguous float arrays, along with the running
+    totals of quantity and cost from the best level, so that queries are a bisection.
+    """
+    __slots__ = ('rates', 'quantities', 'cumulative_quantities', 'cumulative_costs', 'keys', 'descending')
+
+    def __init__(self, rates, quantities, descending=False):
+        """
+        Args:
+            rates (iterable(float)): Levels rates, sorted best first
+            quantities (iterable(float)): Levels quantities
+            descending (bool): Whether the best rate is the highest one (bids)
+        """
+        self.rates = rates
+        self.quantities = quantities
+        self.descending = descending
+
+        np = numpy()
+        if np is not None and isinstance(rates, np.ndarray):
+            self.cumulative_quantities = np.cumsum(quantities)
+            self.cumulative_costs = np.cumsum(rates * quantities)
+            self.keys = -rates if descending else rates
+        else:
+            total_quantity = total_cost = 0.0
+            self.cumulative_quantities = array('d')
+            self.cumulative_costs = array('d')
+            for rate, quantity in zip(rates, quantities):
+                total_quantity += quantity
+                total_cost += rate * quantity
+                self.cumulative_quantities.append(total_quantity)
+                self.cumulative_costs.append(total_cost)
+            self.keys = array('d', (-rate for rate in rates)) if descending else rates
+
+    @classmethod
+    def from_orders(cls, orders, descending=False):
+        """
+        Args:
+            orders (list(dict)): API orders, with `Rate` and `Quantity` keys
+            descending (bool): Whether the best rate is the highest one (bids)
+        """
+        orders = sorted(orders, key=lambda order: order['Rate'], reverse=descending)
+        return cls(
+            float_array((order['Rate'] for order in orders), len(orders)),
+            float_array((order['Quantity'] for order in orders), len(orders)),
+            descending)
+
+    def __len__(self):
+        return len(self.rates)
+
+    def __iter__(self):
+        """
+        Yields:
+            tuple(float, float): rate and quantity of each level, best first
+        """
+        return zip(self.rates, self.quantities)
+
+    @property
+    def best(self):
+        """
+        float: best rate, `None` when empty
+        """
+        return float(self.rates[0]) if len(self.rates) else None
+
+    @property
+    def total(self):
+        """
+        float: total quantity
+        """
+        return float(self.cumulative_quantities[-1]) if len(self.rates) else 0.0
+
+    def depth_at(self, price):
+        """
+        Returns:
+            float: quantity available at `price` or better
+        """
+        index = bisect_right(self.keys, -price if self.descending else price)
+        return float(self.cumulative_quantities[index - 1]) if index else 0.0
+
+    def vwap_for(self, quantity):
+        """
+        Returns:
+            float: average rate to fill `quantity` from the best level, `None` when there is not enough depth
+        """
+        if quantity <= 0:
+            return self.best
+
+        index = bisect_left(self.cumulative_quantities, quantity)
+        if index >= len(self.rates):
+            return None
+
+        if not index:
+            return self.best
+        cost = self.cumulative_costs[index - 1]
+        cost += (quantity - self.cumulative_quantities[index - 1]) * self.rates[index]
+        return float(cost / quantity)
+
+    def diff(self, other):
+        """
+        Merge the two sorted ladders, level by level.
+
+        Args:
+            other (OrderBookSide): Newer state of the same side
+
+        Returns:
+            list(tuple(str, float, float)): action ("add", "change" or "remove"), rate and new quantity
+        """
+        old_keys, old_rates, old_quantities = self.keys.tolist(), self.rates.tolist(), self.quantities.tolist()
+        new_keys, new_rates, new_quantities = other.keys.tolist(), other.rates.tolist(), other.quantities.tolist()
+        old_count, new_count = len(old_keys), len(new_keys)
+        updates = []
+        i = j = 0
+        while i < old_count or j < new_count:
+            if j >= new_count or (i < old_count and old_keys[i] < new_keys[j]):
+                updates.append(('remove', old_rates[i], 0.0))
+                i += 1
+            elif i >= old_count or new_keys[j] < old_keys[i]:
+                updates.append(('add', new_rates[j], new_quantities[j]))
+                j += 1
+            else:
+                if old_quantities[i] != new_quantities[j]:
+                    updates.append(('change', new_rates[j], new_quantities[j]))
+                i += 1
+                j += 1
+        return updates
+
+    def apply(self, updates):
+        """
+        Args:
+            updates (iterable(tuple(str, float, float))): action, rate and quantity, as returned by `diff`
+
+        Returns:
+            OrderBookSide: new side with the updates applied
+        """
+        levels = dict(zip(self.rates.tolist(), self.quantities.tolist()))
+        for action, rate, quantity in updates:
+            if action == 'remove':
+                levels.pop(rate, None)
+            else:
+                levels[rate] = quantity
+        rates = sorted(levels, reverse=self.descending)
+        return OrderBookSide(
+            float_array(rates, len(rates)),
+            float_array((levels[rate] for rate in rates), len(rates)),
+            self.descending)
+
+
+class OrderBook(object):
+    """
+    Compact order book, as returned by `CCexAPIPublic.get_orderbook` in typed mode.
+
+    Bids and asks are `OrderBookSide`, stored in contiguous float arrays
+    (NumPy ones when available) instead of lists of dicts.
+
+    Examples::
+
+            ccex = CCexAPI(typed=True)
+            book = ccex.public.get_orderbook('USD-BTC', 'both', 100)
+            book.spread, book.vwap_for(2.5)
+
+    """
+    __slots__ = ('bids', 'asks')
+
+    def __init__(self, bids, asks):
+        """
+        Args:
+            bids (OrderBookSide): buy orders, highest rate first
+            asks (OrderBookSide): sell orders, lowest rate first
+        """
+        self.bids = bids
+        self.asks = asks
+
+    @classmethod
+    def from_result(cls, result):
+        """
+        Build an order book from a `get_orderbook` result.
+
+        Args:
+            result (dict): `buy` and/or `sell` lists of orders
+        """
+        return cls(
+            OrderBookSide.from_orders(result.get('buy') or (), descending=True),
+            OrderBookSide.from_orders(result.get('sell') or ()))
+
+    def __repr__(self):
+        return '<OrderBook bids={} asks={} best_bid={} best_ask={}>'.format(
+            len(self.bids), len(self.asks), self.best_bid, self.best_ask)
+
+    @property
+    def best_bid(self):
+        """
+        float: highest buy rate, `None` when there is none
+        """
+        return self.bids.best
+
+    @property
+    def best_ask(self):
+        """
+        float: lowest sell rate, `None` when there is none
+        """
+        return self.asks.best
+
+    @property
+    def spread(self):
+        """
+        float: difference between best ask and best bid, `None` when a side is empty
+        """
+        if self.best_bid is None or self.best_ask is None:
+            return None
+        return self.best_ask - self.best_bid
+
+    def depth_at(self, price):
+        """
+        Quantity tradable up to a given price.
+
+        Returns:
+            tuple(float, float): bids quantity at `price` or higher, asks quantity at `price` or lower
+        """
+        return self.bids.depth_at(price), self.asks.depth_at(price)
+
+    def vwap_for(self, quantity, side='buy'):
+        """
+        Average rate to fill a market order.
+
+        Args:
+            quantity (float): Quantity to fill
+            side (str): "buy" to walk the asks, "sell" to walk the bids
+
+        Returns:
+            float: average rate, `None` when there is not enough depth
+        """
+        return (self.asks if side == 'buy' else self.bids).vwap_for(quantity)
+
+    def diff(self, other):
+        """
+        Level updates turning this book into `other`.
+
+        Returns:
+            list(LevelUpdate): bids updates then asks ones, best levels first
+        """
+        return [LevelUpdate('buy', *update) for update in self.bids.diff(other.bids)] + \
+            [LevelUpdate('sell', *update) for update in self.asks.diff(other.asks)]
+
+    def apply(self, updates):
+        """
+        Returns:
+            OrderBook: new book with level updates, as returned by `diff`, applied
+        """
+        bids = [update[1:] for update in updates if update[0] == 'buy']
+        asks = [update[1:] for update in updates if update[0] == 'sell']
+        return OrderBook(self.bids.apply(bids) if bids else self.bids, self.asks.apply(asks) if asks else self.asks)
+
+    def checksum(self):
+        """
+        CRC32 of the rates and quantities of both sides, equal for books having the same levels.
+
+        Returns:
+            int: checksum
+        """
+        checksum = 0
+        for values in (self.bids.rates, self.bids.quantities, self.asks.rates, self.asks.quantities):
+            checksum = zlib.crc32(_tobytes(values), checksum)
+        return checksum & 0xffffffff
+
+
+_empty_books = []
+
+
+def _empty_book():
+    """
+    Book without any level, built on first use so that NumPy is not imported along the package.
+    """
+    if not _empty_books:
+        _empty_books.append(OrderBook(
+            OrderBookSide(float_array(()), float_array(()), True), OrderBookSide(float_array(()), float_array(()))))
+    return _empty_books[0]
+
+
+class OrderBookTracker(object):
+    """
+    Keep the last order book of each market, and turn each new poll into level updates.
+
+    Books must be polled with both sides (`get_orderbook(market, 'both', depth)`), a missing side
+    would be reported as all its levels removed.
+
+    Examples::
+
+            tracker = OrderBookTracker()
+            while True:
+                book = ccex.public.get_orderbook('USD-BTC', 'both', 100)
+                for side, action, rate, quantity in tracker.update('USD-BTC', book):
+                    ...
+
+            # consumer side, applying the updates to its own copy
+            local = local.apply(updates)
+            assert local.checksum() == tracker.checksum('USD-BTC')
+
+    """
+
+    def __init__(self):
+        self.books = {}
+
+    def __contains__(self, market):
+        return market.lower() in self.books
+
+    def __getitem__(self, market):
+        """
+        Returns:
+            OrderBook: last order book of a market
+        """
+        return self.books[market.lower()]
+
+    def get(self, market, default=None):
+        return self.books.get(market.lower(), default)
+
+    def forget(self, market):
+        """
+        Drop the book of a market, its next update reports all levels as added.
+        """
+        self.books.pop(market.lower(), None)
+
+    def update(self, market, book):
+        """
+        Args:
+            market (str): Market name
+            book (OrderBook|dict): New order book, typed or a raw `get_orderbook` result
+
+        Returns:
+            list(LevelUpdate): changes since the previous book of the market, all levels for the first one
+        """
+        if not isinstance(book, OrderBook):
+            book = OrderBook.from_result(book)
+        market = market.lower()
+        previous = self.books.get(market)
+        if previous is None:
+            previous = _empty_book()
+        self.books[market] = book
+        return previous.diff(book)
+
+    def checksum(self, market):
+        """
+        Returns:
+            int: checksum of the last book of a market, see `OrderBook.checksum`
+        """
+        return self.books[market.lower()].checksum()
+
+
+class FullOrderBook(object):
+    """
+    Order books of all markets, as returned by `CCexAPIPublic.get_full_orderbook` in typed mode.
+
+    The flat `buy` / `sell` lists are grouped by market in a single pass, with market names
+    interned and lower cased, so getting the book of a market is a dict lookup.
+
+    Examples::
+
+            ccex = CCexAPI(typed=True)
+            books = ccex.public.get_full_orderbook(100)
+            books['btc-ltc'].best_bid
+            markets, market_index, rates, quantities = books.columns('buy')
+
+    """
+    __slots__ = ('books',)
+
+    def __init__(self, books):
+        """
+        Args:
+            books (dict(str, OrderBook)): Order books by market name
+        """
+        self.books = books
+
+    @classmethod
+    def from_records(cls, records):
+        """
+        Build the order books from a stream of orders.
+
+        Args:
+            records (iterable(tuple(str, dict))): side ("buy" or "sell") and order, with a `Market` key
+        """
+        levels = {}
+        for side, order in records:
+            market = order['Market']
+            sides = levels.get(market)
+            if sides is None:
+                sides = levels[market] = ([], [])
+            sides[side == 'sell'].append(order)
+
+        books = {}
+        for market, (buy, sell) in levels.items():
+            books[intern(market.lower())] = OrderBook(
+                OrderBookSide.from_orders(buy, descending=True),
+                OrderBookSide.from_orders(sell))
+        return cls(books)
+
+    @classmethod
+    def from_result(cls, result):
+        """
+        Build the order books from a `get_full_orderbook` result.
+
+        Args:
+            result (dict): `buy` and/or `sell` lists of orders
+        """
+        return cls.from_records(
+            (side, order) for side in ('buy', 'sell') for order in result.get(side) or ())
+
+    def __repr__(self):
+        return '<FullOrderBook markets={}>'.format(len(self.books))
+
+    def __len__(self):
+        return len(self.books)
+
+    def __iter__(self):
+        return iter(self.books)
+
+    def __contains__(self, market):
+        return market.lower() in self.books
+
+    def __getitem__(self, market):
+        """
+        Returns:
+            OrderBook: order book of a market
+        """
+        return self.books[market.lower()]
+
+    def get(self, market, default=None):
+        return self.books.get(market.lower(), default)
+
+    def items(self):
+        return self.books.items()
+
+    def columns(self, side):
+        """
+        Columnar layout of one side of all books, best levels first within each market.
+
+        Args:
+            side (str): "buy" or "sell"
+
+        Returns:
+            tuple(list(str), array, array, array): market names, then per level market index, rate and quantity
+        """
+        markets = sorted(self.books)
+        market_index = array('l')
+        rates = array('d')
+        quantities = array('d')
+        for index, market in enumerate(markets):
+            book_side = self.books[market].bids if side == 'buy' else self.books[market].asks
+            market_index.extend([index] * len(book_side))
+            rates.extend(book_side.rates)
+            quantities.extend(book_side.quantities)
+
+        np = numpy()
+        if np is not None:
+            return markets, np.asarray(market_index), np.asarray(rates), np.asarray(quantities)
+        return markets, market_index, rates, quantities
+
+
+__all__ = ['OrderBook', 'OrderBookSide', 'FullOrderBook', 'OrderBookTracker', 'LevelUpdate']
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+           DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+                    Version 2, December 2004
+
+ Copyright (C) 2004 Sam Hocevar <sam@hocevar.net>
+
+ Everyone is permitted to copy and distribute verbatim or modified
+ copies of this license document, and changing it is allowed as long
+ as the name is changed.
+
+            DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+   TERMS AND CONDITIONS FOR COPYING, DISTRIBUTION AND MODIFICATION
+
+  0. You just DO WHAT THE FUCK YOU WANT TO.
+"""
+
+import threading
+
+from time import time
+
+from .ccex import CCexAPIError
+
+
+class CCexAPIOrder(object):
+    """
+    Local state of an order placed with `CCexAPIOrderRegistry`.
+    """
+    OPEN = 'open'
+    FILLED = 'filled'
+    CANCELLED = 'cancelled'
+
+    __slots__ = ('uuid', 'market', 'type', 'quantity', 'remaining', 'rate', 'status', 'placed', 'updated', 'data')
+
+    def __init__(self, uuid, market, type, quantity, rate, placed=None):
+        """
+        Args:
+            uuid (str): Order uuid
+            market (str): Market name (ex: USD-BTC)
+            type (str): "LIMIT_BUY" or "LIMIT_SELL"
+            quantity (float): Ordered quantity
+            rate (float): Order rate
+            placed (float, optional): Placement timestamp, default to now
+        """
+        self.uuid = uuid
+        self.market = market
+        self.type = type
+        self.quantity = quantity
+        self.remaining = quantity
+        self.rate = rate
+        self.status = self.OPEN
+        self.placed = time() if placed is None else placed
+        self.updated = self.placed
+        self.data = None
+        """ Last order data returned by the API"""
+
+    def __repr__(self):
+        return '<CCexAPIOrder {} {} {} {}/{}@{} {}>'.format(
+            self.uuid, self.market, self.type, self.remaining, self.quantity, self.rate, self.status)
+
+    @property
+    def age(self):
+        """
+        float: seconds since the order was placed
+        """
+        return time() - self.placed
+
+    def update(self, data, status):
+        self.data = data
+        self.status = status
+        remaining = data.get('QuantityRemaining')
+        if remaining is not None:
+            self.remaining = float(remaining)
+        self.updated = time()
+
+
+class CCexAPIOrderRegistry(object):
+    """
+    Registry of the orders placed through it, refreshed with one `get_open_orders` call
+    per market having open orders instead of one `get_order` call per order.
+
+    Orders missing from the open orders of their market are looked up once with `get_order`,
+    to tell whether they were filled or cancelled. Queries never call the API.
+
+    Examples::
+
+            orders = CCexAPIOrderRegistry(CCexAPI('api_key', 'api_secret'))
+            orders.buy_limit('USD-BTC', 0.1, 4000)
+            ...
+            orders.refresh()
+            for order in orders.query(market='USD-BTC', status=CCexAPIOrder.OPEN, older_than=60):
+                ...
+
+    """
+
+    def __init__(self, api, workers=None):
+        """
+        Args:
+            api (CCexAPI): Client, or its private endpoints group
+            workers (int, optional): Maximum number of concurrent calls of a refresh,
+                default to `CCexAPIPrivate.BATCH_WORKERS`. Above 1, nonces may reach the API out of order
+        """
+        self.private = getattr(api, 'private', api)
+        self.workers = workers
+        self.lock = threading.Lock()
+        self.orders = {}
+        self.open_by_market = {}
+        self.errors = {}
+        """ Errors of the last refresh, by market or order uuid"""
+
+    def __len__(self):
+        return len(self.orders)
+
+    def __iter__(self):
+        with self.lock:
+            return iter(list(self.orders.values()))
+
+    def __contains__(self, uuid):
+        return uuid in self.orders
+
+    def __getitem__(self, uuid):
+        """
+        Returns:
+            CCexAPIOrder: order of an uuid
+        """
+        return self.orders[uuid]
+
+    def get(self, uuid, default=None):
+        return self.orders.get(uuid, default)
+
+    def buy_limit(self, market, quantity, rate):
+        """
+        Place a buy limit order and track it, see `CCexAPIPrivate.buy_limit`.
+
+        Returns:
+            CCexAPIOrder: the order
+        """
+        return self.track(self.private.buy_limit(market, quantity, rate), market, 'LIMIT_BUY', quantity, rate)
+
+    def sell_limit(self, market, quantity, rate):
+        """
+        Place a sell limit order and track it, see `CCexAPIPrivate.sell_limit`.
+
+        Returns:
+            CCexAPIOrder: the order
+        """
+        return self.track(self.private.sell_limit(market, quantity, rate), market, 'LIMIT_SELL', quantity, rate)
+
+    def track(self, uuid, market, type, quantity, rate, placed=None):
+        """
+        Track an order placed by other means.
+
+        Returns:
+            CCexAPIOrder: the order
+        """
+        order = CCexAPIOrder(uuid, market, type, quantity, rate, placed)
+        with self.lock:
+            self.orders[uuid] = order
+            self.open_by_market.setdefault(market.lower(), {})[uuid] = order
+        return order
+
+    def forget(self, uuid):
+        """
+        Stop tracking an order.
+        """
+        with self.lock:
+            order = self.orders.pop(uuid, None)
+            if order is not None:
+                self._closed(order)
+
+    def prune(self, older_than=0):
+        """
+        Stop tracking closed orders.
+
+        Args:
+            older_than (float): Only those last updated more than `older_than` seconds ago
+
+        Returns:
+            int: number of orders no longer tracked
+        """
+        deadline = time() - older_than
+        with self.lock:
+            pruned = [uuid for uuid, order in self.orders.items()
+                      if order.status != CCexAPIOrder.OPEN and order.updated <= deadline]
+            for uuid in pruned:
+                del self.orders[uuid]
+        return len(pruned)
+
+    def query(self, market=None, status=None, older_than=None, newer_than=None):
+        """
+        Filter tracked orders, without calling the API.
+
+        Args:
+            market (str, optional): Market name
+            status (str, optional): `CCexAPIOrder.OPEN`, `FILLED` or `CANCELLED`
+            older_than (float, optional): Minimum age in seconds
+            newer_than (float, optional): Maximum age in seconds
+
+        Returns:
+            list(CCexAPIOrder): matching orders, oldest first
+        """
+        with self.lock:
+            if status == CCexAPIOrder.OPEN:
+                orders = [order for by_uuid in self.open_by_market.values() for order in by_uuid.values()]
+            else:
+                orders = list(self.orders.values())
+
+        now = time()
+        if market is not None:
+            market = market.lower()
+            orders = [order for order in orders if order.market.lower() == market]
+        if status is not None:
+            orders = [order for order in orders if order.status == status]
+        if older_than is not None:
+            orders = [order for order in orders if now - order.placed >= older_than]
+        if newer_than is not None:
+            orders = [order for order in orders if now - order.placed <= newer_than]
+        orders.sort(key=lambda order: order.placed)
+        return orders
+
+    def refresh(self):
+        """
+        Update the open orders: one `get_open_orders` call per market having some,
+        then one `get_order` call per order no longer open.
+
+        Errors are recorded in `errors`, orders of a failed call are left unchanged.
+
+        Returns:
+            list(CCexAPIOrder): orders closed since the previous refresh
+        """
+        with self.lock:
+            markets = dict((market, list(orders.values())) for market, orders in self.open_by_market.items())
+
+        errors = {}
+        open_orders = self.private.get_open_orders_batch(markets, workers=self.workers)
+        errors.update(open_orders.errors)
+
+        missing = []
+        for market, orders in markets.items():
+            if market not in open_orders:
+                continue
+            listed = dict((data['OrderUuid'], data) for data in open_orders[market] or ())
+            for order in orders:
+                data = listed.get(order.uuid)
+                if data is not None:
+                    order.update(data, CCexAPIOrder.OPEN)
+                else:
+                    missing.append(order)
+
+        closed = []
+        for order in missing:
+            try:
+                data = self.private.get_order(order.uuid)
+            except CCexAPIError as exc:
+                errors[order.uuid] = exc
+                continue
+            if isinstance(data, list):
+                data = data[0] if data else None
+            if not data:
+                # unknown to the API for now, not a proof it was cancelled
+                errors[order.uuid] = CCexAPIError('Order {} not found'.format(order.uuid))
+                continue
+            if data.get('IsOpen'):
+                # not listed yet
+                order.update(data, CCexAPIOrder.OPEN)
+                continue
+            order.update(data, CCexAPIOrder.CANCELLED)
+            if not order.remaining:
+                order.status = CCexAPIOrder.FILLED
+            closed.append(order)
+
+        with self.lock:
+            for order in closed:
+                self._closed(order)
+        self.errors = errors
+        return closed
+
+    def _closed(self, order):
+        market = order.market.lower()
+        orders = self.open_by_market.get(market)
+        if orders is not None:
+            orders.pop(order.uuid, None)
+            if not orders:
+                del self.open_by_market[market]
+
+
+__all__ = ['CCexAPIOrderRegistry', 'CCexAPIOrder']
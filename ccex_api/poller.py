@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+           DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+                    Version 2, December 2004
+
+ Copyright (C) 2004 Sam Hocevar <sam@hocevar.net>
+
+ Everyone is permitted to copy and distribute verbatim or modified
+ copies of this license document, and changing it is allowed as long
+ as the name is changed.
+
+            DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+   TERMS AND CONDITIONS FOR COPYING, DISTRIBUTION AND MODIFICATION
+
+  0. You just DO WHAT THE FUCK YOU WANT TO.
+"""
+
+from time import sleep
+
+
+class CCexAPITradePoller(object):
+    """
+    Incremental trade history poller, only returning trades not seen yet.
+
+    The highest trade `Id` of each market is remembered, and nothing else, so memory
+    stays bounded whatever the number of polls.
+    When all trades of a response are new, some may have been missed: the response is
+    fetched again with a larger `count`, up to `max_count`. The count then shrinks back
+    once markets calm down.
+
+    Without `markets`, all markets are polled with a single `get_full_market_history` call.
+
+    Examples::
+
+            poller = CCexAPITradePoller(CCexAPI(), markets=['USD-BTC', 'LTC-BTC'])
+            for market, trade in poller.poll():
+                ...
+
+            for market, trade in CCexAPITradePoller(CCexAPI()).run(interval=5):
+                ...
+
+    """
+
+    def __init__(self, api, markets=None, count=50, max_count=100, initial=True):
+        """
+        Args:
+            api (CCexAPI): Client, or its public endpoints group
+            markets (list(str), optional): Markets to poll, default to all markets at once
+            count (int): Number of trades requested per call
+            max_count (int): Maximum number of trades requested when a gap is detected
+            initial (bool): Whether the first poll of a market returns the trades already there
+        """
+        self.public = getattr(api, 'public', api)
+        self.markets = markets
+        self.base_count = count
+        self.max_count = max_count
+        self.initial = initial
+
+        self.last_ids = {}
+        self.counts = {}
+        self.gaps = 0
+        """ Number of responses where trades may have been missed even at `max_count`"""
+
+    def poll(self):
+        """
+        Fetch the trades that occurred since the previous poll.
+
+        Returns:
+            list(tuple(str, dict)): market name and trade, oldest first within each market
+        """
+        if self.markets is None:
+            return self._poll(None, lambda count: self.public.get_full_market_history(count))
+
+        trades = []
+        for market in self.markets:
+            trades.extend(self._poll(market, lambda count: self.public.get_market_history(market, count)))
+        return trades
+
+    def run(self, interval=1):
+        """
+        Poll forever.
+
+        Args:
+            interval (float): Seconds between two polls
+
+        Yields:
+            tuple(str, dict): market name and trade
+        """
+        while True:
+            for trade in self.poll():
+                yield trade
+            sleep(interval)
+
+    def _poll(self, market, fetch):
+        count = self.counts.get(market, self.base_count)
+        while True:
+            trades_by_market = self._by_market(market, fetch(count) or [])
+            new_by_market = dict((trade_market, self._new_trades(trade_market, trades))
+                                 for trade_market, trades in trades_by_market.items())
+            # `count` applies per market, a market whose trades are all new may have missed some
+            gap = any(len(trades) >= count and len(new_by_market[trade_market]) == len(trades) and
+                      trade_market in self.last_ids for trade_market, trades in trades_by_market.items())
+            if not gap:
+                break
+            if count >= self.max_count:
+                self.gaps += 1
+                break
+            count = min(count * 2, self.max_count)
+
+        # shrink back when far less trades than requested are new, in every market
+        if max([len(trades) for trades in new_by_market.values()] or [0]) < count // 4:
+            count = max(count // 2, self.base_count)
+        self.counts[market] = count
+
+        new_trades = []
+        for trade_market in sorted(trades_by_market):
+            self.last_ids[trade_market] = max(
+                [self.last_ids.get(trade_market, 0)] + [trade['Id'] for trade in trades_by_market[trade_market]])
+            new_trades.extend((trade_market, trade)
+                              for trade in sorted(new_by_market[trade_market], key=lambda trade: trade['Id']))
+        return new_trades
+
+    @staticmethod
+    def _by_market(market, trades):
+        """
+        Returns:
+            dict(str, list(dict)): trades of a response by lower cased market name
+        """
+        if market is not None:
+            return {market.lower(): trades} if trades else {}
+        trades_by_market = {}
+        for trade in trades:
+            trades_by_market.setdefault(trade['Market'].lower(), []).append(trade)
+        return trades_by_market
+
+    def _new_trades(self, market, trades):
+        """
+        Returns:
+            list(dict): trades of a market not seen yet
+        """
+        last_id = self.last_ids.get(market)
+        if last_id is None:
+            return list(trades) if self.initial else []
+        return [trade for trade in trades if trade['Id'] > last_id]
+
+
+__all__ = ['CCexAPITradePoller']
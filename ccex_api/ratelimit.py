@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+           DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+                    Version 2, December 2004
+
+ Copyright (C) 2004 Sam Hocevar <sam@hocevar.net>
+
+ Everyone is permitted to copy and distribute verbatim or modified
+ copies of this license document, and changing it is allowed as long
+ as the name is changed.
+
+            DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+   TERMS AND CONDITIONS FOR COPYING, DISTRIBUTION AND MODIFICATION
+
+  0. You just DO WHAT THE FUCK YOU WANT TO.
+"""
+
+import itertools
+import threading
+
+from collections import deque
+
+try:
+    from time import monotonic
+except ImportError:  # python 2
+    from time import time as monotonic
+
+
+class TokenBucket(object):
+    """
+    Token bucket, refilled continuously at `rate` tokens per second up to `capacity`.
+    """
+    __slots__ = ('rate', 'capacity', 'tokens', 'updated')
+
+    def __init__(self, rate, capacity=None):
+        """
+        Args:
+            rate (float): Tokens per second
+            capacity (float, optional): Maximum burst, default to one second worth of tokens.
+                At least one token, or a call could never be let through
+        """
+        self.rate = float(rate)
+        self.capacity = float(max(capacity or rate, 1))
+        self.tokens = self.capacity
+        self.updated = monotonic()
+
+    def refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, tokens=1):
+        """
+        Returns:
+            float: seconds before `tokens` are available, 0 if they already are
+        """
+        return max(0.0, (tokens - self.tokens) / self.rate)
+
+
+class _Ticket(object):
+    __slots__ = ('kind', 'priority', 'seq', 'enqueued')
+
+    def __init__(self, kind, priority, seq, enqueued):
+        self.kind = kind
+        self.priority = priority
+        self.seq = seq
+        self.enqueued = enqueued
+
+
+class CCexAPIRateLimiter(object):
+    """
+    Client side rate limiter of API calls, one token bucket per endpoint class
+    (`ticker` for JSON tickers, `public` for `api_pub.html`, `private` for `api.html`)
+    and one for all of them.
+
+    Callers of a class are served in arrival order. When several classes are waiting on
+    the global bucket, the one with the lowest `PRIORITIES` value goes first, so order
+    calls are not delayed by bulk public polling.
+
+    Examples::
+
+            limiter = CCexAPIRateLimiter(rates={'public': 2}, total=8)
+            ccex = CCexAPI('api_key', 'api_secret', limiter=limiter)
+            ...
+            limiter.stats()['public']['queued']
+
+    """
+
+    RATES = {
+        'ticker': 5,
+        'public': 5,
+        'private': 5,
+    }
+    """ Default calls per second by endpoint class"""
+
+    PRIORITIES = {
+        'private': 0,
+        'ticker': 1,
+        'public': 1,
+    }
+    """ Lower is served first"""
+
+    def __init__(self, rates=None, total=10, burst=None):
+        """
+        Args:
+            rates (dict(str, float), optional): Calls per second by endpoint class, merged with `RATES`
+            total (float, optional): Calls per second for all classes, `None` for no global limit
+            burst (float, optional): Bucket capacities in seconds worth of calls, default to 1
+        """
+        burst = burst or 1
+        rates = dict(self.RATES, **(rates or {}))
+        self.buckets = dict((kind, TokenBucket(rate, rate * burst)) for kind, rate in rates.items())
+        self.total = TokenBucket(total, total * burst) if total else None
+
+        self.lock = threading.Lock()
+        self.condition = threading.Condition(self.lock)
+        self.sequence = itertools.count()
+        self.queues = dict((kind, deque()) for kind in self.buckets)
+        self.metrics = dict((kind, {'acquired': 0, 'wait_total': 0.0, 'wait_max': 0.0}) for kind in self.buckets)
+
+    def stats(self):
+        """
+        Returns:
+            dict(str, dict): by endpoint class, number of `queued` callers, of `acquired` calls,
+                and `wait_total`, `wait_max` and `wait_mean` seconds
+        """
+        with self.lock:
+            stats = {}
+            for kind, metrics in self.metrics.items():
+                stats[kind] = dict(metrics, queued=len(self.queues[kind]))
+                stats[kind]['wait_mean'] = metrics['wait_total'] / metrics['acquired'] if metrics['acquired'] else 0.0
+            return stats
+
+    def enqueue(self, kind):
+        """
+        Take a place in the queue of an endpoint class.
+
+        Returns:
+            object: ticket to `poll` or `cancel`
+        """
+        with self.lock:
+            ticket = _Ticket(kind, self.PRIORITIES.get(kind, 1), next(self.sequence), monotonic())
+            self.queues[kind].append(ticket)
+            return ticket
+
+    def poll(self, ticket):
+        """
+        Try to acquire a call for a ticket, without blocking.
+
+        Returns:
+            float: 0 when acquired, otherwise an estimation of the seconds to wait before polling again
+        """
+        with self.lock:
+            return self._poll(ticket)
+
+    def cancel(self, ticket):
+        """
+        Leave the queue without acquiring a call.
+        """
+        with self.lock:
+            try:
+                self.queues[ticket.kind].remove(ticket)
+            except ValueError:
+                pass
+            self.condition.notify_all()
+
+    def acquire(self, kind):
+        """
+        Block until a call of an endpoint class is allowed.
+        """
+        ticket = self.enqueue(kind)
+        try:
+            with self.condition:
+                while True:
+                    wait = self._poll(ticket)
+                    if not wait:
+                        return
+                    self.condition.wait(wait)
+        except BaseException:
+            self.cancel(ticket)
+            raise
+
+    def _poll(self, ticket):
+        bucket = self.buckets[ticket.kind]
+        queue = self.queues[ticket.kind]
+        now = monotonic()
+        bucket.refill(now)
+        if self.total is not None:
+            self.total.refill(now)
+
+        # wait for the ones ahead in the same class
+        if queue[0] is not ticket:
+            return max(bucket.delay(queue.index(ticket) + 1), 0.001)
+
+        wait = bucket.delay()
+        if self.total is not None:
+            # wait for higher priority classes heads
+            ahead = sum(
+                1 for kind, other in self.queues.items()
+                if other and kind != ticket.kind and (other[0].priority, other[0].seq) < (ticket.priority, ticket.seq)
+            )
+            wait = max(wait, self.total.delay(ahead + 1))
+        if wait > 0:
+            return wait
+
+        bucket.tokens -= 1
+        if self.total is not None:
+            self.total.tokens -= 1
+        queue.popleft()
+
+        waited = now - ticket.enqueued
+        metrics = self.metrics[ticket.kind]
+        metrics['acquired'] += 1
+        metrics['wait_total'] += waited
+        metrics['wait_max'] = max(metrics['wait_max'], waited)
+        self.condition.notify_all()
+        return 0
+
+
+__all__ = ['CCexAPIRateLimiter', 'TokenBucket']
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+           DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+                    Version 2, December 2004
+
+ Copyright (C) 2004 Sam Hocevar <sam@hocevar.net>
+
+ Everyone is permitted to copy and distribute verbatim or modified
+ copies of this license document, and changing it is allowed as long
+ as the name is changed.
+
+            DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+   TERMS AND CONDITIONS FOR COPYING, DISTRIBUTION AND MODIFICATION
+
+  0. You just DO WHAT THE FUCK YOU WANT TO.
+"""
+
+try:
+    from sys import intern
+except ImportError:  # python 2
+    pass
+
+
+def number(value):
+    """
+    Returns:
+        float: `value` as a float, `None` when missing
+    """
+    return None if value is None else float(value)
+
+
+def timestamp(value):
+    """
+    Convert an API timestamp, either epoch seconds or an UTC "YYYY-MM-DD HH:MM:SS" date, to epoch seconds.
+
+    Returns:
+        int: epoch seconds, `None` when missing
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if value.isdigit():
+        return int(value)
+
+    import calendar
+    from time import strptime
+    return calendar.timegm(strptime(value.replace('T', ' ')[:19], '%Y-%m-%d %H:%M:%S'))
+
+
+class Record(object):
+    """
+    Base of typed results, fields are `__slots__` attributes, parsed once.
+    """
+    __slots__ = ()
+
+    def __repr__(self):
+        fields = ' '.join('{}={!r}'.format(field, getattr(self, field)) for field in self.__slots__)
+        return '<{} {}>'.format(self.__class__.__name__, fields)
+
+    def __eq__(self, other):
+        return self.__class__ is other.__class__ and all(
+            getattr(self, field) == getattr(other, field) for field in self.__slots__)
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def as_dict(self):
+        """
+        Returns:
+            dict: fields values by name
+        """
+        return dict((field, getattr(self, field)) for field in self.__slots__)
+
+
+class MarketSummary(Record):
+    """
+    Last 24 hours summary of a market, as returned by `CCexAPIPublic.get_market_summaries` in typed mode.
+    """
+    __slots__ = ('market_name', 'high', 'low', 'volume', 'last', 'base_volume', 'timestamp', 'bid', 'ask',
+                 'open_buy_orders', 'open_sell_orders', 'prev_day', 'created')
+
+    def __init__(self, market_name, high, low, volume, last, base_volume, timestamp, bid, ask,
+                 open_buy_orders, open_sell_orders, prev_day, created):
+        self.market_name = market_name
+        self.high = high
+        self.low = low
+        self.volume = volume
+        self.last = last
+        self.base_volume = base_volume
+        self.timestamp = timestamp
+        self.bid = bid
+        self.ask = ask
+        self.open_buy_orders = open_buy_orders
+        self.open_sell_orders = open_sell_orders
+        self.prev_day = prev_day
+        self.created = created
+
+    @classmethod
+    def from_dict(cls, summary):
+        """
+        Args:
+            summary (dict): API market summary
+        """
+        get = summary.get
+        return cls(
+            intern(str(summary['MarketName'])),
+            number(get('High')),
+            number(get('Low')),
+            number(get('Volume')),
+            number(get('Last')),
+            number(get('BaseVolume')),
+            timestamp(get('TimeStamp')),
+            number(get('Bid')),
+            number(get('Ask')),
+            int(get('OpenBuyOrders') or 0),
+            int(get('OpenSellOrders') or 0),
+            number(get('PrevDay')),
+            timestamp(get('Created')))
+
+    @classmethod
+    def from_result(cls, result):
+        """
+        Build the summaries of a `get_market_summaries` result.
+
+        Returns:
+            list(MarketSummary): summaries in the result order
+        """
+        return [cls.from_dict(summary) for summary in result or ()]
+
+
+class Ticker(Record):
+    """
+    Market data of a pair, as returned by `CCexAPITickers.tickers_pair_market_data` in typed mode.
+    Fields are named as the API ones.
+    """
+    __slots__ = ('high', 'low', 'avg', 'lastbuy', 'lastsell', 'buy', 'sell', 'lastprice', 'buysupport', 'updated')
+
+    def __init__(self, high, low, avg, lastbuy, lastsell, buy, sell, lastprice, buysupport, updated):
+        self.high = high
+        self.low = low
+        self.avg = avg
+        self.lastbuy = lastbuy
+        self.lastsell = lastsell
+        self.buy = buy
+        self.sell = sell
+        self.lastprice = lastprice
+        self.buysupport = buysupport
+        self.updated = updated
+
+    @classmethod
+    def from_dict(cls, ticker):
+        """
+        Args:
+            ticker (dict): API ticker
+        """
+        get = ticker.get
+        return cls(
+            number(get('high')),
+            number(get('low')),
+            number(get('avg')),
+            number(get('lastbuy')),
+            number(get('lastsell')),
+            number(get('buy')),
+            number(get('sell')),
+            number(get('lastprice')),
+            number(get('buysupport')),
+            timestamp(get('updated')))
+
+    @classmethod
+    def from_result(cls, result):
+        """
+        Build the tickers of a `tickers_all_pairs_market_data` result.
+
+        Returns:
+            dict(str, Ticker): tickers by interned pair name
+        """
+        return dict((intern(str(pair)), cls.from_dict(ticker)) for pair, ticker in (result or {}).items())
+
+
+class Volume(Record):
+    """
+    24 hours volume of a market, as returned by `CCexAPITickers.tickers_volume_coin` in typed mode.
+    """
+    __slots__ = ('last', 'vol')
+
+    def __init__(self, last, vol):
+        self.last = last
+        self.vol = vol
+
+    @classmethod
+    def from_dict(cls, volume):
+        """
+        Args:
+            volume (dict): API volume
+        """
+        return cls(number(volume.get('last')), number(volume.get('vol')))
+
+    @classmethod
+    def from_result(cls, result):
+        """
+        Build the volumes of a `tickers_volume_coin` result.
+
+        Returns:
+            dict(str, Volume): volumes by interned coin name
+        """
+        return dict((intern(str(coin)), cls.from_dict(volume)) for coin, volume in (result or {}).items())
+
+
+__all__ = ['MarketSummary', 'Ticker', 'Volume']
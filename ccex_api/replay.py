@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+           DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+                    Version 2, December 2004
+
+ Copyright (C) 2004 Sam Hocevar <sam@hocevar.net>
+
+ Everyone is permitted to copy and distribute verbatim or modified
+ copies of this license document, and changing it is allowed as long
+ as the name is changed.
+
+            DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+   TERMS AND CONDITIONS FOR COPYING, DISTRIBUTION AND MODIFICATION
+
+  0. You just DO WHAT THE FUCK YOU WANT TO.
+"""
+
+import os
+import zlib
+import struct
+import codecs
+import threading
+
+from time import time, sleep
+from bisect import bisect_left, bisect_right
+from datetime import timedelta
+
+try:
+    from urllib.parse import urlsplit, parse_qsl, urlencode
+except ImportError:  # python 2
+    from urlparse import urlsplit, parse_qsl
+    from urllib import urlencode
+
+try:
+    from time import perf_counter
+except ImportError:  # python 2
+    from time import time as perf_counter
+
+from .ccex import CCexAPIError, CCexAPITransport
+
+MAGIC = b'CCEXREC1'
+FRAME = struct.Struct('<dfHHI')
+""" Frame header: response time, duration, status code, key size and compressed body size"""
+IGNORED_PARAMS = ('apikey', 'nonce')
+""" Request parameters left out of the recorded keys, they change between calls or are credentials"""
+
+
+def request_key(request):
+    """
+    Key a request is recorded and replayed under: method, URL path and sorted parameters,
+    without host, credentials nor nonce, so that a recording replays with any API URL and key.
+
+    Args:
+        request (CCexAPIRequest): Request
+
+    Returns:
+        str: request key (ex: "GET /t/api_pub.html?a=getorderbook&depth=50&market=usd-btc&type=both")
+    """
+    url = urlsplit(request.url)
+    params = sorted((name, value) for name, value in parse_qsl(url.query, True) if name not in IGNORED_PARAMS)
+    return '{} {}?{}'.format(request.method, url.path, urlencode(params))
+
+
+def iter_frames(f):
+    """
+    Read the frames headers of a recording, skipping the bodies.
+    Stops at the first incomplete frame, left by an interrupted write.
+
+    Args:
+        f (file): Recording opened in binary mode, positioned after its magic
+
+    Yields:
+        tuple(float, float, int, str, int, int): response time, duration, status code, request key,
+            body offset and compressed body size
+    """
+    size = os.fstat(f.fileno()).st_size
+    while True:
+        header = f.read(FRAME.size)
+        if len(header) < FRAME.size:
+            return
+        received, duration, status, key_size, body_size = FRAME.unpack(header)
+        key = f.read(key_size)
+        offset = f.tell()
+        f.seek(body_size, os.SEEK_CUR)
+        if len(key) < key_size or offset + body_size > size:
+            return
+        yield received, duration, status, key.decode('utf-8'), offset, body_size
+
+
+class CCexAPIReplayError(CCexAPIError):
+    """
+    No recorded response for a replayed request.
+    """
+
+
+class CCexAPIReplayResponse(object):
+    """
+    Recorded response, with the parts of `requests.Response` the clients use.
+    """
+
+    def __init__(self, url, status_code, content, duration=0.0):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.encoding = 'utf-8'
+        self.headers = {'Content-Type': 'application/json'}
+        self.elapsed = timedelta(seconds=duration)
+
+    def __repr__(self):
+        return '<CCexAPIReplayResponse [{}]>'.format(self.status_code)
+
+    @property
+    def ok(self):
+        return self.status_code < 400
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', 'replace')
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        chunk_size = chunk_size or len(self.content) or 1
+        decoder = codecs.getincrementaldecoder(self.encoding or 'utf-8')('replace') if decode_unicode else None
+        for start in range(0, len(self.content), chunk_size):
+            chunk = self.content[start:start + chunk_size]
+            yield decoder.decode(chunk) if decoder is not None else chunk
+        if decoder is not None:
+            tail = decoder.decode(b'', True)
+            if tail:
+                yield tail
+
+    def close(self):
+        pass
+
+
+class CCexAPIRecordingTransport(object):
+    """
+    Transport sending requests with another one, and appending every response to a recording.
+
+    A recording is a `MAGIC` header then one frame per response: a `FRAME` header, the request key
+    (see `request_key`) and the zlib compressed body. Frames are appended in time order and flushed
+    one by one, an interrupted write is dropped when the recording is opened again.
+    Streamed responses are downloaded in full to be recorded.
+
+    Examples::
+
+            ccex = CCexAPI(transport=CCexAPIRecordingTransport('/var/lib/bot/ccex.rec'))
+            while True:
+                ccex.tickers.tickers_all_pairs_market_data()
+                sleep(5)
+
+    """
+
+    def __init__(self, path, transport=None, level=1):
+        """
+        Args:
+            path (str): Recording file, appended to when it exists
+            transport (CCexAPITransport, optional): Transport actually sending the requests
+            level (int): zlib compression level, the fastest one by default as it runs on the calls path
+        """
+        self.path = path
+        self.transport = transport or CCexAPITransport()
+        self.level = level
+        self.lock = threading.Lock()
+        self.file = self._open(path)
+
+    @staticmethod
+    def _open(path):
+        f = open(path, 'a+b')
+        f.seek(0)
+        magic = f.read(len(MAGIC))
+        if not magic:
+            f.write(MAGIC)
+        elif magic != MAGIC:
+            f.close()
+            raise CCexAPIError('{} is not a CCex API recording'.format(path))
+        else:
+            end = len(MAGIC)
+            for _, _, _, _, offset, body_size in iter_frames(f):
+                end = offset + body_size
+            f.truncate(end)
+        f.flush()
+        return f
+
+    @property
+    def session(self):
+        return self.transport.session
+
+    def send(self, request, stream=False):
+        """
+        Send a request with the wrapped transport and record its response.
+
+        Returns:
+            requests.Response: server response, its body already downloaded
+        """
+        started = perf_counter()
+        res = self.transport.send(request, stream=stream)
+        content = res.content
+        duration = perf_counter() - started
+        self.record(request_key(request), content, res.status_code, duration)
+        return res
+
+    def record(self, key, content, status=200, duration=0.0, received=None):
+        """
+        Append a response to the recording.
+
+        Args:
+            key (str): Request key
+            content (bytes): Response body
+            status (int): Response status code
+            duration (float): Seconds the request took
+            received (float, optional): Epoch time of the response, default to now
+        """
+        key = key.encode('utf-8')
+        body = zlib.compress(content, self.level)
+        header = FRAME.pack(time() if received is None else received, duration, status, len(key), len(body))
+        with self.lock:
+            self.file.write(header + key + body)
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+        self.transport.close()
+
+
+class CCexAPIReplayTransport(object):
+    """
+    Transport serving the responses of a recording, without any network access,
+    so that all endpoints methods run unchanged on recorded traffic.
+
+    Replay follows a clock starting at the first recorded response:
+
+    - at full speed (`speed=None`), each request is answered with the next response recorded for it,
+      the clock jumping to its time,
+    - at a time scale (ex: `speed=60` for one recorded minute per second), each request is answered with
+      the last response recorded for it before the clock, waiting for the first one if needed.
+
+    Replay ends, and requests raise `CCexAPIReplayError`, when there is no more response recorded
+    for a request; clients wrap it in a `CCexAPIRequestError`.
+
+    Examples::
+
+            transport = CCexAPIReplayTransport('/var/lib/bot/ccex.rec', speed=None)
+            ccex = CCexAPI(transport=transport)
+            while not transport.exhausted:
+                prices = ccex.tickers.tickers_all_pairs_market_data()
+                print(transport.time, len(prices))
+
+    """
+    session = None
+
+    def __init__(self, path, speed=None, start=None, end=None):
+        """
+        Args:
+            path (str): Recording file
+            speed (float, optional): Replay time scale, as fast as possible when `None`
+            start (float, optional): Epoch time of the first replayed responses, default to the recording start
+            end (float, optional): Epoch time after which responses are not replayed, default to the recording end
+        """
+        self.path = path
+        self.speed = speed
+        self.lock = threading.Lock()
+        self.file = open(path, 'rb')
+        if self.file.read(len(MAGIC)) != MAGIC:
+            self.file.close()
+            raise CCexAPIError('{} is not a CCex API recording'.format(path))
+
+        # responses of each key in time order: times, then (duration, status, body offset, body size)
+        self.index = {}
+        self.count = 0
+        self.first = self.last = None
+        for received, duration, status, key, offset, body_size in iter_frames(self.file):
+            if (start is not None and received < start) or (end is not None and received > end):
+                continue
+            times, frames = self.index.setdefault(key, ([], []))
+            times.append(received)
+            frames.append((duration, status, offset, body_size))
+            self.count += 1
+            self.first = received if self.first is None else min(self.first, received)
+            self.last = received if self.last is None else max(self.last, received)
+
+        self.served = {}
+        self.origin = self.first if start is None else start
+        self.clock = self.origin
+        self.started = None
+
+    @property
+    def time(self):
+        """
+        float: replay clock, epoch time of the recorded traffic being replayed
+        """
+        if self.speed is None or self.started is None:
+            return self.clock
+        return self.origin + (perf_counter() - self.started) * self.speed
+
+    @property
+    def exhausted(self):
+        """
+        bool: whether the replay clock passed the last recorded response
+        """
+        if self.last is None:
+            return True
+        if self.speed is None:
+            return all(self._next(key, times) >= len(times) for key, (times, _) in self.index.items())
+        return self.time > self.last
+
+    def _next(self, key, times):
+        return max(self.served.get(key, -1) + 1, bisect_left(times, self.clock))
+
+    def keys(self):
+        """
+        Returns:
+            list(str): recorded request keys
+        """
+        return sorted(self.index)
+
+    def send(self, request, stream=False):
+        """
+        Answer a request with a recorded response.
+
+        Returns:
+            CCexAPIReplayResponse: recorded response
+        """
+        key = request_key(request)
+        recorded = self.index.get(key)
+        if recorded is None:
+            raise CCexAPIReplayError('No response recorded for {}'.format(key))
+        times, frames = recorded
+
+        with self.lock:
+            if self.started is None:
+                self.started = perf_counter()
+            if self.speed is None:
+                position = self._next(key, times)
+                if position >= len(times):
+                    raise CCexAPIReplayError('No more responses recorded for {}'.format(key))
+                self.clock = max(self.clock, times[position])
+                wait = 0
+            else:
+                now = self.time
+                if now > self.last:
+                    raise CCexAPIReplayError('Replay ended at {}'.format(self.last))
+                position = max(bisect_right(times, now) - 1, 0)
+                wait = (times[0] - now) / self.speed
+            self.served[key] = position
+
+        if wait > 0:
+            # not recorded yet, wait for the clock to reach the first response
+            sleep(wait)
+
+        with self.lock:
+            duration, status, offset, body_size = frames[position]
+            self.file.seek(offset)
+            body = self.file.read(body_size)
+
+        return CCexAPIReplayResponse(request.url, status, zlib.decompress(body), duration)
+
+    def rewind(self):
+        """
+        Restart the replay from the beginning.
+        """
+        with self.lock:
+            self.served = {}
+            self.clock = self.origin
+            self.started = None
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+__all__ = ['CCexAPIRecordingTransport', 'CCexAPIReplayTransport', 'CCexAPIReplayResponse', 'CCexAPIReplayError',
+           'request_key']
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+           DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+                    Version 2, December 2004
+
+ Copyright (C) 2004 Sam Hocevar <sam@hocevar.net>
+
+ Everyone is permitted to copy and distribute verbatim or modified
+ copies of this license document, and changing it is allowed as long
+ as the name is changed.
+
+            DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+   TERMS AND CONDITIONS FOR COPYING, DISTRIBUTION AND MODIFICATION
+
+  0. You just DO WHAT THE FUCK YOU WANT TO.
+"""
+
+import random
+import threading
+
+from .ccex import CCexAPIMaintenanceError, CCexAPICircuitOpenError
+
+try:
+    from time import monotonic
+except ImportError:  # python 2
+    from time import time as monotonic
+
+
+class CCexAPIRetry(object):
+    """
+    Retry policy of tickers and public calls, with exponential backoff and full jitter.
+
+    Only `TRANSIENT_ERRORS` are retried. Authenticated calls never are: they may not be
+    idempotent (ex: `buy_limit`).
+
+    Examples::
+
+            ccex = CCexAPI(retry=CCexAPIRetry(retries=5, backoff=0.5))
+
+    """
+
+    def __init__(self, retries=3, backoff=0.5, max_backoff=30, jitter=True):
+        """
+        Args:
+            retries (int): Maximum number of retries of a call
+            backoff (float): Seconds before the first retry, doubled on each following one
+            max_backoff (float): Maximum seconds between two tries
+            jitter (bool): Wait a random time between 0 and the backoff, so clients do not retry all at once
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+
+    def delays(self):
+        """
+        Yields:
+            float: seconds to wait before each retry
+        """
+        for attempt in range(self.retries):
+            delay = min(self.max_backoff, self.backoff * 2 ** attempt)
+            yield random.uniform(0, delay) if self.jitter else delay
+
+
+class CCexAPICircuitBreaker(object):
+    """
+    Fail fast while the API is down.
+
+    The circuit opens after `threshold` consecutive transient errors, or at once on
+    maintenance. While open, calls raise `CCexAPICircuitOpenError` without querying the API.
+    After `reset_timeout` seconds a single probe call is let through: its success closes
+    the circuit, its failure opens it again. A probe interrupted before either (ex: a cancelled
+    coroutine) is released with `cancel`, so that the next call probes the API instead.
+
+    Examples::
+
+            breaker = CCexAPICircuitBreaker(threshold=5, reset_timeout=30)
+            ccex = CCexAPI(breaker=breaker)
+
+    """
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half-open'
+
+    def __init__(self, threshold=5, reset_timeout=30, maintenance_timeout=120):
+        """
+        Args:
+            threshold (int): Consecutive transient errors opening the circuit
+            reset_timeout (float): Seconds before probing the API again
+            maintenance_timeout (float): Seconds before probing the API again after a maintenance page
+        """
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.maintenance_timeout = maintenance_timeout
+
+        self.lock = threading.Lock()
+        self.state = self.CLOSED
+        self.failures = 0
+        self.reopen_at = 0
+
+    def before(self):
+        """
+        Called before each call.
+
+        Returns:
+            bool: whether the call is the probe of a half-open circuit
+
+        Raises:
+            CCexAPICircuitOpenError: when the circuit is open, or another call is already probing the API
+        """
+        with self.lock:
+            if self.state == self.CLOSED:
+                return False
+
+            now = monotonic()
+            if self.state == self.OPEN and now >= self.reopen_at:
+                self.state = self.HALF_OPEN
+                return True
+            raise CCexAPICircuitOpenError(max(0.0, self.reopen_at - now))
+
+    def success(self):
+        """
+        Called after a call reached the API, even when it returned an API error.
+        """
+        with self.lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def failure(self, exc):
+        """
+        Called after a call failed with a transient error.
+
+        Returns:
+            bool: whether the circuit is now open
+        """
+        with self.lock:
+            self.failures += 1
+            maintenance = isinstance(exc, CCexAPIMaintenanceError)
+            if maintenance or self.state == self.HALF_OPEN or self.failures >= self.threshold:
+                self.state = self.OPEN
+                self.reopen_at = monotonic() + (self.maintenance_timeout if maintenance else self.reset_timeout)
+            return self.state == self.OPEN
+
+    def cancel(self, probe):
+        """
+        Called after a call ended without reaching the API nor failing (ex: `KeyboardInterrupt`).
+
+        Args:
+            probe (bool): whether the call was the probe, as returned by `before`
+        """
+        with self.lock:
+            if probe and self.state == self.HALF_OPEN:
+                # back to open, already due for a new probe
+                self.state = self.OPEN
+
+
+__all__ = ['CCexAPIRetry', 'CCexAPICircuitBreaker']
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+           DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+                    Version 2, December 2004
+
+ Copyright (C) 2004 Sam Hocevar <sam@hocevar.net>
+
+ Everyone is permitted to copy and distribute verbatim or modified
+ copies of this license document, and changing it is allowed as long
+ as the name is changed.
+
+            DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+   TERMS AND CONDITIONS FOR COPYING, DISTRIBUTION AND MODIFICATION
+
+  0. You just DO WHAT THE FUCK YOU WANT TO.
+"""
+
+import heapq
+import itertools
+
+from time import sleep
+
+try:
+    from time import monotonic
+except ImportError:  # python 2
+    from time import time as monotonic
+
+from .ccex import CCexAPIError
+
+
+def _get(data, key, attribute):
+    """
+    Field of a raw (dict) or typed (record) result.
+    """
+    if isinstance(data, dict):
+        return data.get(key)
+    return getattr(data, attribute, None)
+
+
+class CCexAPIPollScheduler(object):
+    """
+    Poll each market at a frequency following its activity, within a budget of requests per second.
+
+    Each market gets a weight from signals the API already gives, every one scaled to [0, 1]:
+
+    - `activity`: how often the `updated` field of its ticker moved between polls (moving average)
+    - `volume`: its 24 hours `vol` from `tickers_volume_coin`, relative to the other markets of its base coin
+    - `orders`: its `OpenBuyOrders` and `OpenSellOrders` from `get_market_summaries`, relative to the others
+
+    Polling rates are proportional to `FLOOR` plus the weighted signals, bounded by `min_interval` and
+    `max_interval`, and scaled so that polls and signals refreshes fit the budget. When even `max_interval`
+    does not fit, the budget wins and dead markets are polled less often than that.
+
+    Examples::
+
+            scheduler = CCexAPIPollScheduler(CCexAPI(), budget=4, depth=20)
+            for market, ticker, book in scheduler.run():
+                ...
+
+    """
+
+    WEIGHTS = {
+        'activity': 4.0,
+        'volume': 2.0,
+        'orders': 1.0,
+    }
+    """ Weight of each signal"""
+
+    FLOOR = 0.1
+    """ Weight of a market without any signal"""
+
+    def __init__(self, api, markets=None, budget=2.0, depth=None, min_interval=1.0, max_interval=600.0,
+                 signals_interval=300.0, smoothing=0.2, weights=None):
+        """
+        Args:
+            api (CCexAPI): Client
+            markets (list(str), optional): Markets to poll, default to all the markets of `get_market_summaries`
+            budget (float): Requests per second, signals refreshes included
+            depth (int, optional): Also fetch the order book of polled markets, at this depth
+            min_interval (float): Minimum seconds between two polls of a market
+            max_interval (float): Maximum seconds between two polls of a market, unless the budget is too low
+            signals_interval (float): Seconds between two refreshes of the volumes and open orders
+            smoothing (float): Weight of the last poll in the `activity` moving average
+            weights (dict(str, float), optional): Signals weights, merged with `WEIGHTS`
+        """
+        self.tickers = api.tickers
+        self.public = api.public
+        self.budget = float(budget)
+        self.depth = depth
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.signals_interval = signals_interval
+        self.smoothing = smoothing
+        self.weights = dict(self.WEIGHTS, **(weights or {}))
+
+        self.markets = [market.lower() for market in markets] if markets is not None else None
+        self.signals = {}
+        """ dict(str, dict(str, float)): signals of each market"""
+        self.updated = {}
+        self.intervals = {}
+        """ dict(str, float): seconds between two polls of each market"""
+        self.polled = {}
+        self.queue = []
+        self.sequence = itertools.count()
+        self.signals_due = None
+        self.errors = {}
+        """ Errors of the last polls, by market, `None` for signals refreshes"""
+
+    @property
+    def cost(self):
+        """
+        int: requests sent per poll of a market
+        """
+        return 2 if self.depth else 1
+
+    def refresh_signals(self, now=None):
+        """
+        Fetch the open orders of all markets, and the volumes of their base coins, then plan the polls again.
+        """
+        now = monotonic() if now is None else now
+        self.signals_due = now + self.signals_interval
+
+        summaries = self.public.get_market_summaries() or []
+        orders = {}
+        for summary in summaries:
+            market = _get(summary, 'MarketName', 'market_name').lower()
+            orders[market] = ((_get(summary, 'OpenBuyOrders', 'open_buy_orders') or 0) +
+                              (_get(summary, 'OpenSellOrders', 'open_sell_orders') or 0))
+        if self.markets is None:
+            self.markets = sorted(orders)
+
+        volumes = {}
+        for base in sorted(set(market.split('-', 1)[-1] for market in self.markets)):
+            try:
+                result = self.tickers.tickers_volume_coin(base) or {}
+            except CCexAPIError as exc:
+                self.errors[None] = exc
+                continue
+            base_volumes = dict(('{}-{}'.format(coin.lower(), base), float(_get(volume, 'vol', 'vol') or 0))
+                                for coin, volume in result.items())
+            highest = max(base_volumes.values()) if base_volumes else 0
+            for market, volume in base_volumes.items():
+                volumes[market] = volume / highest if highest > 0 else 0.0
+
+        most_orders = max([orders.get(market, 0) for market in self.markets] or [0])
+        for market in self.markets:
+            signals = self.signals.setdefault(market, {'activity': 0.5})
+            signals['volume'] = volumes.get(market, 0.0)
+            signals['orders'] = float(orders.get(market, 0)) / most_orders if most_orders else 0.0
+        self.plan(now)
+
+    def weight(self, market):
+        """
+        Returns:
+            float: polling weight of a market
+        """
+        signals = self.signals.get(market, {})
+        return self.FLOOR + sum(weight * signals.get(signal, 0.0) for signal, weight in self.weights.items())
+
+    def plan(self, now=None):
+        """
+        Compute the polling interval of each market from its weight, and schedule their next polls.
+        """
+        now = monotonic() if now is None else now
+        markets = self.markets or []
+        if not markets:
+            self.intervals = {}
+            self.queue = []
+            return
+
+        bases = len(set(market.split('-', 1)[-1] for market in markets))
+        available = max(self.budget - (1.0 + bases) / self.signals_interval, 0.0) / self.cost
+        weights = [self.weight(market) for market in markets]
+        low, high = 1.0 / self.max_interval, 1.0 / self.min_interval
+
+        if low * len(markets) >= available:
+            # the budget wins over max_interval
+            rates = [available / len(markets)] * len(markets)
+        elif high * len(markets) <= available:
+            rates = [high] * len(markets)
+        else:
+            # scale factor such that the bounded rates add up to the budget, by bisection
+            lowest, highest = 0.0, high / max(min(weights), 1e-12)
+            for _ in range(60):
+                scale = (lowest + highest) / 2
+                if sum(min(max(scale * weight, low), high) for weight in weights) > available:
+                    highest = scale
+                else:
+                    lowest = scale
+            rates = [min(max(lowest * weight, low), high) for weight in weights]
+
+        self.intervals = dict((market, 1.0 / rate if rate > 0 else float('inf'))
+                              for market, rate in zip(markets, rates))
+        # never polled markets are spread over their first interval, instead of all polled at once
+        self.queue = [(self.polled.get(market, now - interval * (1 - float(index) / len(markets))) + interval,
+                       next(self.sequence), market)
+                      for index, (market, interval) in enumerate(sorted(self.intervals.items()))]
+        heapq.heapify(self.queue)
+
+    def observe(self, market, ticker):
+        """
+        Update the activity of a market from one of its tickers, raw or typed.
+
+        Returns:
+            bool: whether the ticker `updated` field moved since the previous one
+        """
+        updated = _get(ticker, 'updated', 'updated')
+        previous = self.updated.get(market)
+        self.updated[market] = updated
+        if previous is None:
+            return True
+
+        moved = updated != previous
+        signals = self.signals.setdefault(market, {'activity': 0.5})
+        signals['activity'] += self.smoothing * ((1.0 if moved else 0.0) - signals['activity'])
+        return moved
+
+    def next_due(self):
+        """
+        Returns:
+            float: `monotonic` time of the next poll or signals refresh
+        """
+        due = self.signals_due if self.signals_due is not None else monotonic()
+        if self.queue:
+            due = min(due, self.queue[0][0])
+        return due
+
+    def poll(self, now=None):
+        """
+        Poll the markets due, refreshing the signals first when due.
+        Errors are recorded in `errors`, failed markets are polled again at their next turn.
+
+        Returns:
+            list(tuple(str, dict, dict)): market name, ticker and order book (`None` without `depth`)
+        """
+        now = monotonic() if now is None else now
+        if self.signals_due is None or self.signals_due <= now:
+            try:
+                self.refresh_signals(now)
+            except CCexAPIError as exc:
+                self.errors[None] = exc
+                if self.markets is None:
+                    # nothing to poll until the markets are known
+                    self.signals_due = now + self.min_interval
+                elif not self.queue:
+                    self.plan(now)
+
+        polled = []
+        while self.queue and self.queue[0][0] <= now:
+            _, _, market = heapq.heappop(self.queue)
+            self.polled[market] = now
+            heapq.heappush(self.queue, (now + self.intervals[market], next(self.sequence), market))
+            try:
+                ticker = self.tickers.tickers_pair_market_data(*market.split('-', 1))
+                book = self.public.get_orderbook(market, 'both', self.depth) if self.depth else None
+            except CCexAPIError as exc:
+                self.errors[market] = exc
+                continue
+            self.errors.pop(market, None)
+            self.observe(market, ticker)
+            polled.append((market, ticker, book))
+        return polled
+
+    def run(self):
+        """
+        Poll forever, sleeping until the next poll is due.
+
+        Yields:
+            tuple(str, dict, dict): market name, ticker and order book (`None` without `depth`)
+        """
+        while True:
+            for polled in self.poll():
+                yield polled
+            sleep(max(self.next_due() - monotonic(), 0))
+
+
+__all__ = ['CCexAPIPollScheduler']
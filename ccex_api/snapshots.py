@@ -0,0 +1,370 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+           DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+                    Version 2, December 2004
+
+ Copyright (C) 2004 Sam Hocevar <sam@hocevar.net>
+
+ Everyone is permitted to copy and distribute verbatim or modified
+ copies of this license document, and changing it is allowed as long
+ as the name is changed.
+
+            DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+   TERMS AND CONDITIONS FOR COPYING, DISTRIBUTION AND MODIFICATION
+
+  0. You just DO WHAT THE FUCK YOU WANT TO.
+"""
+
+import os
+import re
+import sys
+import mmap
+import threading
+
+from time import time as _now
+from array import array
+from bisect import bisect_left
+
+from .orderbook import numpy, float_array, _tobytes
+from .records import timestamp
+
+NAN = float('nan')
+
+
+def _value(value):
+    return NAN if value is None else float(value)
+
+
+class TickerSnapshot(object):
+    """
+    Columnar table of the tickers of all pairs at one point in time: a pair index
+    and one float64 column per field, NumPy arrays when available. Missing values are NaN.
+
+    Examples::
+
+            snapshot = TickerSnapshot.from_prices(ccex.tickers.tickers_all_pairs_market_data())
+            snapshot.column('lastprice')[snapshot.index['usd-btc']]
+
+    """
+    FIELDS = ('high', 'low', 'avg', 'buy', 'sell', 'lastprice', 'updated')
+    """ Columns, in storage order"""
+
+    __slots__ = ('time', 'pairs', 'index', 'columns')
+
+    def __init__(self, pairs, columns, time=None):
+        """
+        Args:
+            pairs (list(str)): Pairs names, lower cased
+            columns (dict(str, array)): Values of each of `FIELDS`, in `pairs` order
+            time (float, optional): Snapshot timestamp, default to now
+        """
+        self.time = _now() if time is None else time
+        self.pairs = pairs
+        self.index = dict((pair, row) for row, pair in enumerate(pairs))
+        self.columns = columns
+
+    @classmethod
+    def from_rows(cls, rows, time=None):
+        """
+        Args:
+            rows (list(tuple(str, tuple(float)))): pair name and values of `FIELDS`
+            time (float, optional): Snapshot timestamp, default to now
+        """
+        pairs = [pair for pair, _ in rows]
+        columns = dict(
+            (field, float_array((values[column] for _, values in rows), len(rows)))
+            for column, field in enumerate(cls.FIELDS))
+        return cls(pairs, columns, time)
+
+    @classmethod
+    def from_prices(cls, result, time=None):
+        """
+        Build a snapshot from a `tickers_all_pairs_market_data` result, raw or typed.
+        """
+        rows = []
+        for pair, ticker in sorted((result or {}).items()):
+            get = ticker.get if isinstance(ticker, dict) else lambda field: getattr(ticker, field)
+            rows.append((pair.lower(), tuple(
+                _value(get(field)) if field != 'updated' else _value(timestamp(get(field)))
+                for field in cls.FIELDS)))
+        return cls.from_rows(rows, time)
+
+    @classmethod
+    def from_summaries(cls, result, time=None):
+        """
+        Build a snapshot from a `get_market_summaries` result, raw or typed.
+        Bid and ask are stored as `buy` and `sell`, last as `lastprice`, and there is no average.
+        """
+        rows = []
+        for summary in result or ():
+            if isinstance(summary, dict):
+                pair = summary['MarketName']
+                values = (summary.get('High'), summary.get('Low'), None, summary.get('Bid'), summary.get('Ask'),
+                          summary.get('Last'), timestamp(summary.get('TimeStamp')))
+            else:
+                pair = summary.market_name
+                values = (summary.high, summary.low, None, summary.bid, summary.ask,
+                          summary.last, summary.timestamp)
+            rows.append((pair.lower(), tuple(_value(value) for value in values)))
+        rows.sort(key=lambda row: row[0])
+        return cls.from_rows(rows, time)
+
+    def __repr__(self):
+        return '<TickerSnapshot time={} pairs={}>'.format(self.time, len(self.pairs))
+
+    def __len__(self):
+        return len(self.pairs)
+
+    def __contains__(self, pair):
+        return pair.lower() in self.index
+
+    def column(self, field):
+        """
+        Returns:
+            array: values of a field, in `pairs` order
+        """
+        return self.columns[field]
+
+    def row(self, pair):
+        """
+        Returns:
+            dict(str, float): values of a pair by field
+        """
+        row = self.index[pair.lower()]
+        return dict((field, float(self.columns[field][row])) for field in self.FIELDS)
+
+
+class TickerDelta(object):
+    """
+    Changes between consecutive `tickers_all_pairs_market_data` results.
+
+    Only the `updated` timestamp and field values of the previous result are kept. Pairs whose
+    `updated` timestamp did not move are skipped without comparing their fields.
+
+    Examples::
+
+            delta = TickerDelta()
+            while True:
+                for pair, fields in delta.update(ccex.tickers.tickers_all_pairs_market_data()).items():
+                    ...
+
+    """
+    FIELDS = ('high', 'low', 'avg', 'lastbuy', 'lastsell', 'buy', 'sell', 'lastprice', 'buysupport')
+    """ Compared fields"""
+
+    def __init__(self, fields=None):
+        """
+        Args:
+            fields (tuple(str), optional): Fields to compare, default to `FIELDS`
+        """
+        self.fields = tuple(fields or self.FIELDS)
+        self.previous = {}
+
+    def reset(self):
+        """
+        Forget the previous result, the next update returns all pairs.
+        """
+        self.previous = {}
+
+    def update(self, result):
+        """
+        Compare a result with the previous one.
+
+        Args:
+            result (dict): `tickers_all_pairs_market_data` result, raw or typed
+
+        Returns:
+            dict(str, dict): changed fields values by pair, all of them for new pairs, `None` for removed pairs
+        """
+        fields = self.fields
+        previous = self.previous
+        current = {}
+        changes = {}
+        for pair, ticker in (result or {}).items():
+            if isinstance(ticker, dict):
+                updated = ticker.get('updated')
+                last = previous.get(pair)
+                if last is not None and updated is not None and last[0] == updated:
+                    current[pair] = last
+                    continue
+                values = tuple(ticker.get(field) for field in fields)
+            else:
+                updated = ticker.updated
+                last = previous.get(pair)
+                if last is not None and updated is not None and last[0] == updated:
+                    current[pair] = last
+                    continue
+                values = tuple(getattr(ticker, field) for field in fields)
+
+            current[pair] = updated, values
+            if last is None:
+                changes[pair] = dict(zip(fields, values))
+                continue
+            changed = dict((field, value) for field, value, last_value in zip(fields, values, last[1])
+                           if value != last_value)
+            if changed:
+                changes[pair] = changed
+
+        for pair in previous:
+            if pair not in current:
+                changes[pair] = None
+        self.previous = current
+        return changes
+
+
+class CCexAPITickerStore(object):
+    """
+    Append only on-disk store of ticker snapshots, one file per pair.
+
+    Each file is an array of fixed width float64 records: snapshot time then `TickerSnapshot.FIELDS`,
+    so it can be memory mapped as is (ex: `numpy.memmap(path).reshape(-1, 8)`).
+    Reading a time range of a pair maps its file and bisects the time column,
+    nothing else is read. Snapshots must be appended in time order.
+
+    Examples::
+
+            with CCexAPITickerStore('/var/lib/bot/tickers') as store:
+                while True:
+                    store.append(TickerSnapshot.from_prices(ccex.tickers.tickers_all_pairs_market_data()))
+                    sleep(5)
+
+            store = CCexAPITickerStore('/var/lib/bot/tickers')
+            store.read('usd-btc', start=time() - 3600)['lastprice']
+
+    """
+    FIELDS = ('time',) + TickerSnapshot.FIELDS
+    RECORD_SIZE = 8 * len(FIELDS)
+    EXTENSION = '.f64'
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Directory of the store, created when missing
+        """
+        self.path = path
+        if not os.path.isdir(path):
+            os.makedirs(path)
+        self.lock = threading.Lock()
+        self.files = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        with self.lock:
+            for f in self.files.values():
+                f.close()
+            self.files = {}
+
+    def pairs(self):
+        """
+        Returns:
+            list(str): pairs having records
+        """
+        return sorted(name[:-len(self.EXTENSION)] for name in os.listdir(self.path) if name.endswith(self.EXTENSION))
+
+    def file_path(self, pair):
+        return os.path.join(self.path, re.sub(r'[^a-z0-9_-]', '_', pair.lower()) + self.EXTENSION)
+
+    def append(self, snapshot):
+        """
+        Append one record per pair of a snapshot, files stay open between calls.
+
+        Args:
+            snapshot (TickerSnapshot): Snapshot to store
+        """
+        columns = [snapshot.columns[field] for field in TickerSnapshot.FIELDS]
+        record = array('d', [0.0] * len(self.FIELDS))
+        record[0] = snapshot.time
+        with self.lock:
+            for row, pair in enumerate(snapshot.pairs):
+                for column, values in enumerate(columns, 1):
+                    record[column] = values[row]
+                f = self.files.get(pair)
+                if f is None:
+                    f = self.files[pair] = open(self.file_path(pair), 'ab')
+                    # drop a record partially written by a crash
+                    f.truncate(f.tell() - f.tell() % self.RECORD_SIZE)
+                f.write(_little_endian(record))
+            for f in self.files.values():
+                f.flush()
+
+    def read(self, pair, start=None, end=None):
+        """
+        Read the records of a pair within a time range.
+
+        Args:
+            pair (str): Pair name
+            start (float, optional): Earliest snapshot time, included
+            end (float, optional): Latest snapshot time, excluded
+
+        Returns:
+            dict(str, array): values of `FIELDS`, oldest first.
+                NumPy read only views of the mapped file when available, copies otherwise.
+        """
+        path = self.file_path(pair)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        count = size // self.RECORD_SIZE
+        if not count:
+            return dict((field, float_array(())) for field in self.FIELDS)
+
+        np = numpy()
+        if np is not None:
+            records = np.memmap(path, dtype='<f8', mode='r', shape=(count, len(self.FIELDS)))
+            times = records[:, 0]
+            low = 0 if start is None else int(np.searchsorted(times, start, 'left'))
+            high = count if end is None else int(np.searchsorted(times, end, 'left'))
+            rows = records[low:max(low, high)]
+            return dict((field, rows[:, column]) for column, field in enumerate(self.FIELDS))
+
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), count * self.RECORD_SIZE, access=mmap.ACCESS_READ)
+        try:
+            times = _MappedColumn(mapped, 0, len(self.FIELDS), count)
+            low = 0 if start is None else bisect_left(times, start)
+            high = count if end is None else bisect_left(times, end)
+            rows = array('d', mapped[low * self.RECORD_SIZE:max(low, high) * self.RECORD_SIZE])
+        finally:
+            mapped.close()
+        if sys.byteorder != 'little':
+            rows.byteswap()
+        width = len(self.FIELDS)
+        return dict((field, rows[column::width]) for column, field in enumerate(self.FIELDS))
+
+
+class _MappedColumn(object):
+    """
+    Read only sequence of one column of mapped float64 records, for bisection.
+    """
+
+    def __init__(self, mapped, column, width, count):
+        self.mapped = mapped
+        self.offset = column * 8
+        self.stride = width * 8
+        self.count = count
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        position = index * self.stride + self.offset
+        value = array('d', self.mapped[position:position + 8])
+        if sys.byteorder != 'little':
+            value.byteswap()
+        return value[0]
+
+
+def _little_endian(values):
+    if sys.byteorder == 'little':
+        return _tobytes(values)
+    values = array('d', values)
+    values.byteswap()
+    return _tobytes(values)
+
+
+__all__ = ['TickerSnapshot', 'TickerDelta', 'CCexAPITickerStore']
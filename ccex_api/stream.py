@@ -0,0 +1,349 @@
+#!/usr/bin/env python3
+# vim: set fileencoding=utf-8 :
+
+"""
+           DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+                    Version 2, December 2004
+
+ Copyright (C) 2004 Sam Hocevar <sam@hocevar.net>
+
+ Everyone is permitted to copy and distribute verbatim or modified
+ copies of this license document, and changing it is allowed as long
+ as the name is changed.
+
+            DO WHAT THE FUCK YOU WANT TO PUBLIC LICENSE
+   TERMS AND CONDITIONS FOR COPYING, DISTRIBUTION AND MODIFICATION
+
+  0. You just DO WHAT THE FUCK YOU WANT TO.
+"""
+
+import json
+
+WHITESPACES = ' \t\n\r'
+
+
+def json_loads(fast=False):
+    """
+    Pick a JSON decoder.
+
+    Args:
+        fast (bool): Use `orjson` or `ujson` when one of them is installed
+
+    Returns:
+        callable: decoder of str or bytes JSON documents
+    """
+    if fast:
+        try:
+            import orjson
+            return orjson.loads
+        except ImportError:
+            pass
+        try:
+            import ujson
+            return ujson.loads
+        except ImportError:
+            pass
+    return json.loads
+
+
+def _truncated(buffer, end):
+    """
+    Whether a value decoded up to `end` may be a number cut by the end of the buffer
+    (ex: "1", "1." or "1e-" of "1.5e-8"), its fraction or exponent being left undecoded.
+    """
+    if end == len(buffer):
+        return buffer[end - 1] not in '"]}el'
+    return buffer[end] in '.eE' and not buffer[end:].strip('.eE+-0123456789')
+
+
+_STARVED = object()
+
+
+class JSONStreamParser(object):
+    """
+    Push parser of a JSON document: text chunks are fed as they arrive, and the records
+    of one member of the document object are decoded as soon as they are complete, see `iter_records`.
+
+    The parser never waits for data, so it can be fed between the reads of an asynchronous stream.
+
+    Examples::
+
+            parser = JSONStreamParser()
+            for chunk in chunks:
+                for key, record in parser.feed(chunk):
+                    ...
+            for key, record in parser.close():
+                ...
+
+    """
+
+    def __init__(self, member='result', envelope=None, compact_size=64 * 1024):
+        """
+        Args:
+            member (str): Name of the member to stream
+            envelope (dict, optional): Filled with the other members of the document
+            compact_size (int): Decoded data size above which the buffer is compacted
+        """
+        self.member = member
+        self.envelope = {} if envelope is None else envelope
+        self.compact_size = compact_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ''
+        self.pos = 0
+        self.closed = False
+        self.state = self._start
+        self.name = None
+        self.key = None
+        self.in_object = False
+        self.ready = []
+
+    @property
+    def done(self):
+        """
+        bool: whether the end of the document was reached
+        """
+        return self.state is None
+
+    def feed(self, chunk):
+        """
+        Args:
+            chunk (str): Next text chunk
+
+        Returns:
+            list(tuple(str, object)): key and record of the records completed by the chunk
+        """
+        if self.pos > self.compact_size:
+            self.buffer = self.buffer[self.pos:]
+            self.pos = 0
+        self.buffer += chunk
+        return self._run()
+
+    def close(self):
+        """
+        Mark the end of the stream.
+
+        Returns:
+            list(tuple(str, object)): key and record of the last records
+
+        Raises:
+            ValueError: when the document is incomplete
+        """
+        self.closed = True
+        return self._run()
+
+    def _run(self):
+        while self.state is not None and self.state():
+            pass
+        ready, self.ready = self.ready, []
+        return ready
+
+    def _peek(self):
+        """
+        Returns:
+            str: next non whitespace character, without consuming it, `None` when more data is needed
+        """
+        while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACES:
+            self.pos += 1
+        if self.pos < len(self.buffer):
+            return self.buffer[self.pos]
+        if self.closed:
+            raise ValueError('Unexpected end of JSON stream')
+        return None
+
+    def _expect(self, chars):
+        """
+        Consume the next non whitespace character.
+
+        Returns:
+            str: the consumed character, one of `chars`, `None` when more data is needed
+        """
+        char = self._peek()
+        if char is None:
+            return None
+        if char not in chars:
+            raise ValueError('Expecting one of {!r} at {}, got {!r}'.format(chars, self.pos, char))
+        self.pos += 1
+        return char
+
+    def _decode(self):
+        """
+        Returns:
+            object: next JSON value, `_STARVED` when more data is needed
+        """
+        if self._peek() is None:
+            return _STARVED
+        try:
+            value, end = self.decoder.raw_decode(self.buffer, self.pos)
+        except ValueError:
+            if self.closed:
+                raise
+            return _STARVED
+
+        # a number ending the buffer may continue in the next chunk
+        if not self.closed and _truncated(self.buffer, end):
+            return _STARVED
+        self.pos = end
+        return value
+
+    # states, each returns whether it made progress
+
+    def _start(self):
+        if self._expect('{') is None:
+            return False
+        self.state = self._first
+        return True
+
+    def _first(self):
+        char = self._peek()
+        if char is None:
+            return False
+        if char == '}':
+            self.pos += 1
+            self.state = None
+        else:
+            self.state = self._name
+        return True
+
+    def _name(self):
+        name = self._decode()
+        if name is _STARVED:
+            return False
+        self.name = name
+        self.state = self._colon
+        return True
+
+    def _colon(self):
+        if self._expect(':') is None:
+            return False
+        self.state = self._value
+        return True
+
+    def _value(self):
+        char = self._peek()
+        if char is None:
+            return False
+        if self.name == self.member and char in '[{':
+            self.pos += 1
+            self.key = None
+            self.in_object = char == '{'
+            self.state = self._array_first if char == '[' else self._object_key
+            return True
+
+        value = self._decode()
+        if value is _STARVED:
+            return False
+        self.envelope[self.name] = value
+        self.state = self._next
+        return True
+
+    def _array_first(self):
+        char = self._peek()
+        if char is None:
+            return False
+        if char == ']':
+            self.pos += 1
+            self.state = self._object_separator if self.in_object else self._next
+        else:
+            self.state = self._item
+        return True
+
+    def _item(self):
+        record = self._decode()
+        if record is _STARVED:
+            return False
+        self.ready.append((self.key, record))
+        self.state = self._item_separator
+        return True
+
+    def _item_separator(self):
+        char = self._expect(',]')
+        if char is None:
+            return False
+        if char == ',':
+            self.state = self._item
+        else:
+            self.state = self._object_separator if self.in_object else self._next
+        return True
+
+    def _object_key(self):
+        char = self._peek()
+        if char is None:
+            return False
+        if char == '}':
+            self.pos += 1
+            self.in_object = False
+            self.state = self._next
+            return True
+
+        key = self._decode()
+        if key is _STARVED:
+            return False
+        self.key = key
+        self.state = self._object_colon
+        return True
+
+    def _object_colon(self):
+        if self._expect(':') is None:
+            return False
+        self.state = self._object_value
+        return True
+
+    def _object_value(self):
+        char = self._peek()
+        if char is None:
+            return False
+        if char == '[':
+            self.pos += 1
+            self.state = self._array_first
+            return True
+
+        value = self._decode()
+        if value is _STARVED:
+            return False
+        self.ready.append((self.key, value))
+        self.state = self._object_separator
+        return True
+
+    def _object_separator(self):
+        char = self._peek()
+        if char is None:
+            return False
+        if char == ',':
+            self.pos += 1
+        self.state = self._object_key
+        return True
+
+    def _next(self):
+        char = self._expect(',}')
+        if char is None:
+            return False
+        self.state = self._name if char == ',' else None
+        return True
+
+
+def iter_records(chunks, member='result', envelope=None):
+    """
+    Incrementally decode the records of one member of a JSON object.
+
+    Arrays are yielded item by item with a `None` key. When the member is an object,
+    items of its arrays are yielded with the array key, and its other values as a whole.
+
+    Args:
+        chunks (iterator(str)): Text chunks of the JSON document
+        member (str): Name of the member to stream
+        envelope (dict, optional): Filled with the other members of the document
+
+    Yields:
+        tuple(str, object): key and record
+    """
+    parser = JSONStreamParser(member, envelope)
+    for chunk in chunks:
+        for record in parser.feed(chunk):
+            yield record
+        if parser.done:
+            return
+    for record in parser.close():
+        yield record
+
+
+__all__ = ['json_loads', 'iter_records', 'JSONStreamParser']